@@ -1,10 +1,13 @@
 import streamlit as st
 from components.chat import init_chat, show_chat
+from components.progress import flush_progress
 
 def init_session_state():
     """Initialize session state variables"""
     # Initialize chat with home page agent
     init_chat("yCkrWvHkgm")
+    # Save roadmap progress left pending on the Roadmap page
+    flush_progress(force=True)
 
 def main():
     st.title("AI Coding Tutor")
@@ -0,0 +1,308 @@
+import asyncio
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from pymongo import AsyncMongoClient
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from database import (
+    QUIZ_SUMMARY_PROJECTION,
+    HYBRID_CANDIDATE_FACTOR,
+    LEXICAL_FAST_PATH,
+    MIN_SEARCH_SCORE,
+    RESOURCE_PROJECTION,
+    ROADMAP_PROJECTION,
+    SEARCH_MODE,
+    TEXT_SEARCH_INDEX,
+    VECTOR_BACKEND,
+    Database,
+    embedding_fields,
+    lexical_search_pipeline,
+    relative_scores,
+    scored_resources,
+    search_filter,
+    rescore_results,
+    resource_embedding_text,
+    vector_search_index,
+    vector_search_pipeline,
+)
+from embedding_scheduler import EMBEDDING_WORKERS, EmbeddingScheduler, get_scheduler
+from indexes import search_index_names
+from lexical_index import is_strong_match, reciprocal_rank_fusion
+from mongo_client import close_async_client, get_async_client
+from models import Roadmap, Quiz, QuizSummary, Resource, ScoredResource
+from pagination import Page, build_page, page_pipeline, page_size
+from read_cache import read_cache
+from search_cache import search_cache
+
+
+class AsyncDatabase:
+    """Non-blocking counterpart of Database for the Parlant plugin tools
+
+    Mongo I/O goes through pymongo's asyncio client and embeddings are
+    micro-batched by an EmbeddingScheduler running on its own bounded set of
+    threads, so tool calls never block the PluginServer event loop and
+    concurrent searches share forward passes.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncMongoClient] = None,
+        vector_backend: str = VECTOR_BACKEND,
+        scheduler: Optional[EmbeddingScheduler] = None,
+        search_workers: int = EMBEDDING_WORKERS,
+        search_mode: str = SEARCH_MODE,
+    ):
+        self._shared_client = client is None
+        self.client = client or get_async_client()
+        self.db = self.client.ai_tutor_db
+        self.vector_backend = vector_backend
+        self.search_mode = search_mode
+        self.scheduler = scheduler or get_scheduler()
+        self.search_cache = search_cache
+        self.read_cache = read_cache
+        self._executor = ThreadPoolExecutor(
+            max_workers=search_workers, thread_name_prefix="local-search"
+        )
+        self._sync_db: Optional[Database] = None
+
+    async def _run_in_executor(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed text through the micro-batching scheduler"""
+        return await asyncio.wrap_future(self.scheduler.submit(text))
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts together, in as few batches as the scheduler's batch size allows"""
+        return await asyncio.gather(*map(asyncio.wrap_future, self.scheduler.submit_many(texts)))
+
+    def _local_search_database(self) -> Database:
+        # The local vector and BM25 indexes live in a synchronous Database instance;
+        # searches against it are CPU-bound and run on the executor
+        if self._sync_db is None:
+            self._sync_db = Database(vector_backend="local")
+        return self._sync_db
+
+    async def create_roadmap(self, roadmap: Roadmap) -> str:
+        """Create a new roadmap"""
+        data = roadmap.model_dump(exclude={"mongo_id"})
+        result = await self.db.roadmaps.insert_one(data)
+        self.read_cache.invalidate("roadmaps")
+        return str(result.inserted_id)
+
+    async def create_quiz(self, quiz: Quiz) -> str:
+        """Create a new quiz"""
+        data = quiz.model_dump(exclude={"mongo_id"})
+        result = await self.db.quizzes.insert_one(data)
+        self.read_cache.invalidate("quizzes")
+        return str(result.inserted_id)
+
+    async def create_resource(self, resource: Resource) -> str:
+        """Create a new resource"""
+        data = resource.model_dump(exclude={"mongo_id"})
+        embedding = await self.embed(resource_embedding_text(resource.name, resource.description))
+        data.update(embedding_fields(embedding))
+        result = await self.db.resources.insert_one(data)
+        if self._sync_db is not None:
+            self._sync_db.index_resources([(str(result.inserted_id), resource, embedding)])
+        self.search_cache.invalidate()
+        self.read_cache.invalidate("resources")
+        return str(result.inserted_id)
+
+    async def _insert_many(self, collection, documents: List[dict]) -> List[dict]:
+        """Insert documents unordered and report an id or an error for each
+
+        Returns:
+            One {"id": ...} or {"error": ...} entry per document, in order
+        """
+        if not documents:
+            return []
+        errors = {}
+        try:
+            await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = {error["index"]: error.get("errmsg", "write failed") for error in e.details["writeErrors"]}
+        except PyMongoError as e:
+            # The batch may have been written in part before e.g. the connection dropped
+            written, message = await self._written_ids(collection, documents), f"Write failed: {e}"
+            if written is None:
+                written, message = set(), f"Write not confirmed: {e}"
+            errors = {i: message for i, document in enumerate(documents) if document.get("_id") not in written}
+        self.read_cache.invalidate(collection.name)
+        # insert_many assigns _id on the client, so every document has one
+        return [
+            {"error": errors[i]} if i in errors else {"id": str(document["_id"])}
+            for i, document in enumerate(documents)
+        ]
+
+    async def _written_ids(self, collection, documents: List[dict]) -> Optional[set]:
+        """Which of the documents are stored, None if that can't be checked either"""
+        try:
+            cursor = collection.find({"_id": {"$in": [document.get("_id") for document in documents]}}, {"_id": 1})
+            return {item["_id"] for item in await cursor.to_list()}
+        except PyMongoError:
+            return None
+
+    async def create_roadmaps(self, roadmaps: List[Roadmap]) -> List[dict]:
+        """Create several roadmaps with one insert_many"""
+        return await self._insert_many(
+            self.db.roadmaps, [roadmap.model_dump(exclude={"mongo_id"}) for roadmap in roadmaps]
+        )
+
+    async def create_quizzes(self, quizzes: List[Quiz]) -> List[dict]:
+        """Create several quizzes with one insert_many"""
+        return await self._insert_many(
+            self.db.quizzes, [quiz.model_dump(exclude={"mongo_id"}) for quiz in quizzes]
+        )
+
+    async def create_resources(self, resources: List[Resource]) -> List[dict]:
+        """Create several resources, embedding them together and writing with one insert_many"""
+        embeddings = await self.embed_many([
+            resource_embedding_text(resource.name, resource.description) for resource in resources
+        ])
+        documents = []
+        for resource, embedding in zip(resources, embeddings):
+            data = resource.model_dump(exclude={"mongo_id"})
+            data.update(embedding_fields(embedding))
+            documents.append(data)
+
+        results = await self._insert_many(self.db.resources, documents)
+        if self._sync_db is not None:
+            self._sync_db.index_resources(
+                (result["id"], resource, embedding)
+                for result, resource, embedding in zip(results, resources, embeddings)
+                if "id" in result
+            )
+        self.search_cache.invalidate()
+        return results
+
+    async def page_roadmaps(
+        self, limit: Optional[int] = None, token: Optional[str] = None, count: bool = False
+    ) -> Page[Roadmap]:
+        """Get one page of roadmaps, newest first (see Database.page_roadmaps)"""
+        return await self._page(self.db.roadmaps, Roadmap, ROADMAP_PROJECTION, limit, token, count)
+
+    async def page_quizzes(
+        self, limit: Optional[int] = None, token: Optional[str] = None, count: bool = False
+    ) -> Page[QuizSummary]:
+        """Get one page of quiz summaries, newest first"""
+        return await self._page(self.db.quizzes, QuizSummary, QUIZ_SUMMARY_PROJECTION, limit, token, count)
+
+    async def page_resources(
+        self, limit: Optional[int] = None, token: Optional[str] = None, count: bool = False
+    ) -> Page[Resource]:
+        """Get one page of resources without their embeddings, newest first"""
+        return await self._page(self.db.resources, Resource, RESOURCE_PROJECTION, limit, token, count)
+
+    async def _page(self, collection, model, projection: dict, limit: Optional[int], token: Optional[str], count: bool) -> Page:
+        limit = page_size(limit)
+        cursor = await collection.aggregate(page_pipeline(projection, limit, token))
+        page = build_page(model, await cursor.to_list(), limit)
+        if count:
+            page.total_estimate = await collection.estimated_document_count()
+        return page
+
+    async def search_resources(
+        self,
+        query: str,
+        limit: int = 2,
+        resource_type: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        min_score: Optional[float] = None,
+    ) -> List[ScoredResource]:
+        """Search resources using vector similarity (see Database.search_resources)
+
+        Args:
+            query: The search query text
+            limit: Maximum number of results to return
+            resource_type: Only return resources of this type
+            created_after: Only return resources created at or after this time
+            created_before: Only return resources created at or before this time
+            min_score: Drop results scoring below this (0 to 1)
+
+        Returns:
+            List of resources with their score, sorted by relevance
+        """
+        pre_filter = search_filter(resource_type, created_after, created_before)
+        min_score = MIN_SEARCH_SCORE if min_score is None else min_score
+        cache_key = self.search_cache.key(query, limit, {
+            "resource_type": resource_type,
+            "created_after": created_after,
+            "created_before": created_before,
+            "min_score": min_score,
+        })
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = self.search_cache.generation
+
+        if self.search_mode == "hybrid":
+            resources = await self._search_hybrid(query, limit, pre_filter, min_score)
+        else:
+            resources = await self._search_vector(await self.embed(query), limit, pre_filter, min_score)
+
+        self.search_cache.put(cache_key, resources, generation)
+        return resources
+
+    async def _search_vector(
+        self, query_embedding: List[float], limit: int, pre_filter: Optional[dict] = None, min_score: float = 0.0
+    ) -> List[ScoredResource]:
+        if self.vector_backend == "local":
+            return await self._run_in_executor(
+                self._local_search_database().local_vector_search, query_embedding, limit, pre_filter, min_score
+            )
+        return await self._search_atlas(query_embedding, limit, pre_filter, min_score)
+
+    async def _search_hybrid(
+        self, query: str, limit: int, pre_filter: Optional[dict] = None, min_score: float = 0.0
+    ) -> List[ScoredResource]:
+        """Reciprocal-rank fusion of keyword and vector results (see Database._search_hybrid)"""
+        candidates = limit * HYBRID_CANDIDATE_FACTOR
+        lexical = await self._search_lexical(query, candidates, pre_filter, min_score)
+        if LEXICAL_FAST_PATH and is_strong_match(query, lexical, limit):
+            return lexical[:limit]
+        vector = await self._search_vector(await self.embed(query), candidates, pre_filter, min_score)
+        return reciprocal_rank_fusion([vector, lexical], limit)
+
+    async def _search_lexical(
+        self, query: str, limit: int, pre_filter: Optional[dict] = None, min_score: float = 0.0
+    ) -> List[ScoredResource]:
+        if self.vector_backend == "local":
+            return await self._run_in_executor(
+                self._local_search_database().local_lexical_search, query, limit, pre_filter, min_score
+            )
+        index = await search_index_names.resolve_async(self.db, TEXT_SEARCH_INDEX)
+        cursor = await self.db.resources.aggregate(lexical_search_pipeline(query, limit, index, pre_filter))
+        return scored_resources(relative_scores(await cursor.to_list()), min_score)
+
+    async def _filter_selectivity(self, pre_filter: dict) -> float:
+        """Share of resources matching a search filter, counted once per read-cache lifetime"""
+        async def load():
+            total, matching = await asyncio.gather(
+                self.db.resources.estimated_document_count(),
+                self.db.resources.count_documents(pre_filter),
+            )
+            return matching / total if total else 1.0
+        return await self.read_cache.get_or_load_async("resources", ("selectivity", repr(pre_filter)), load)
+
+    async def _search_atlas(
+        self, query_embedding: List[float], limit: int, pre_filter: Optional[dict] = None, min_score: float = 0.0
+    ) -> List[ScoredResource]:
+        index = await search_index_names.resolve_async(self.db, vector_search_index())
+        selectivity = await self._filter_selectivity(pre_filter) if pre_filter else 1.0
+        cursor = await self.db.resources.aggregate(vector_search_pipeline(
+            query_embedding, limit, index=index, pre_filter=pre_filter, selectivity=selectivity
+        ))
+        results = rescore_results(query_embedding, await cursor.to_list(), limit)
+        return scored_resources(results, min_score)
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+        if self._shared_client:
+            await close_async_client()
+        else:
+            await self.client.close()
@@ -0,0 +1,84 @@
+"""Cold-start benchmark for the Streamlit page processes
+
+Measures how long `import database` takes in a fresh interpreter and the peak
+RSS it leaves behind. `--eager` additionally loads the embedding model right
+after the import, which reproduces the old behaviour where the model was
+created at import time.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--eager]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import database
+if {eager}:
+    from embeddings import embedding_model
+    embedding_model.load()
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": rss_kb / 1024,
+    "torch_imported": "torch" in sys.modules,
+}}))
+"""
+
+
+def run_probe(eager: bool) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE.format(eager=eager)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(label: str, samples: list[dict]) -> dict:
+    seconds = [s["seconds"] for s in samples]
+    rss = [s["max_rss_mb"] for s in samples]
+    summary = {
+        "mode": label,
+        "runs": len(samples),
+        "median_seconds": statistics.median(seconds),
+        "median_max_rss_mb": statistics.median(rss),
+        "torch_imported": any(s["torch_imported"] for s in samples),
+    }
+    print(
+        f"{label:>6}: {summary['median_seconds'] * 1000:8.1f} ms  "
+        f"{summary['median_max_rss_mb']:8.1f} MB RSS  "
+        f"torch loaded: {summary['torch_imported']}"
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true", help="also measure loading the model up front")
+    args = parser.parse_args()
+
+    results = [summarize("lazy", [run_probe(False) for _ in range(args.runs)])]
+    if args.eager:
+        try:
+            results.append(summarize("eager", [run_probe(True) for _ in range(args.runs)]))
+        except RuntimeError as e:
+            print(f"Could not load the embedding model: {e}")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
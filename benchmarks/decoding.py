@@ -0,0 +1,114 @@
+"""Microbenchmark for decoding roadmap and quiz listings
+
+Compares the per-document Model.model_validate used before with the
+trusted-read path (one pre-built list validator per batch with the garbage
+collector paused) on large, deeply nested roadmaps and quizzes.
+
+Usage:
+    python benchmarks/decoding.py [--documents 300] [--repeat 5]
+"""
+import argparse
+import copy
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decoding import decode_trusted, list_adapter
+from models import Quiz, Roadmap
+
+
+def roadmap_document(i: int, topics: int, subtopics: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": f"Roadmap {i}",
+        "description": "A large roadmap",
+        "created_at": datetime.now(),
+        "topics": [
+            {
+                "name": f"Topic {t}",
+                "completed": False,
+                "subtopics": [{"name": f"Subtopic {t}.{s}", "completed": s % 2 == 0} for s in range(subtopics)],
+            }
+            for t in range(topics)
+        ],
+    }
+
+
+def quiz_document(i: int, questions: int, choices: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": f"Quiz {i}",
+        "description": "A large quiz",
+        "created_at": datetime.now(),
+        "questions": [
+            {
+                "question": f"Question {q}?",
+                "choices": [{"text": f"Choice {c}", "is_correct": c == 0} for c in range(choices)],
+                "explanation": "Choice 0 is correct",
+            }
+            for q in range(questions)
+        ],
+    }
+
+
+def as_read(documents: list) -> list:
+    """Fresh copies shaped like Database reads them, with mongo_id instead of _id"""
+    rows = copy.deepcopy(documents)
+    for row in rows:
+        row["mongo_id"] = str(row.pop("_id"))
+    return rows
+
+
+def bench(model, documents: list, batch_size: int, repeat: int) -> dict:
+    def validate_each(rows):
+        return [model.model_validate(row) for row in rows]
+
+    def adapter_batches(rows):
+        adapter = list_adapter(model)
+        return [item for start in range(0, len(rows), batch_size) for item in adapter.validate_python(rows[start:start + batch_size])]
+
+    def trusted_batches(rows):
+        return [item for start in range(0, len(rows), batch_size) for item in decode_trusted(model, rows[start:start + batch_size])]
+
+    results = {}
+    for name, decode in (("model_validate", validate_each), ("list adapter", adapter_batches), ("trusted read", trusted_batches)):
+        samples = []
+        for _ in range(repeat):
+            rows = as_read(documents)
+            start = time.perf_counter()
+            decoded = decode(rows)
+            samples.append(time.perf_counter() - start)
+        assert len(decoded) == len(documents)
+        results[name] = statistics.median(samples)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    roadmaps = [roadmap_document(i, topics=20, subtopics=10) for i in range(args.documents)]
+    quizzes = [quiz_document(i, questions=30, choices=4) for i in range(args.documents)]
+
+    report = {}
+    for label, model, documents in (("roadmaps", Roadmap, roadmaps), ("quizzes", Quiz, quizzes)):
+        report[label] = bench(model, documents, args.batch_size, args.repeat)
+        baseline = report[label]["model_validate"]
+        for name, seconds in report[label].items():
+            print(f"{label:>9} {name:>15}: {seconds * 1000:8.1f} ms  ({baseline / seconds:4.2f}x)")
+
+    print(json.dumps({"documents": args.documents, "seconds": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
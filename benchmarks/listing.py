@@ -0,0 +1,91 @@
+"""Benchmark for the resource listing path
+
+Fills an in-memory mongomock collection with resources carrying 1024-float
+embeddings and compares the old unprojected `list(find())` listing with the
+projected get_all_resources and the streaming iter_resources generator.
+
+Usage:
+    python benchmarks/listing.py [--size 5000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import bson
+import mongomock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import RESOURCE_PROJECTION, Database
+from models import Resource
+
+
+def seed(db: Database, size: int, dimensions: int):
+    rng = random.Random(0)
+    db.db.resources.insert_many([
+        {
+            "name": f"Resource {i}",
+            "description": f"Description of resource {i}",
+            "asset": f"https://example.com/{i}",
+            "resource_type": rng.choice(["video", "article", "code_example"]),
+            "embedding": [rng.random() for _ in range(dimensions)],
+        }
+        for i in range(size)
+    ])
+
+
+def unprojected_listing(db: Database):
+    """The listing as it was before projections: every field, materialised"""
+    resources = []
+    for item in list(db.db.resources.find()):
+        item['mongo_id'] = item.pop('_id')
+        item.pop('embedding', None)
+        resources.append(Resource.model_validate(item))
+    return resources
+
+
+def measure(name: str, listing, fetched_bytes: int) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = sum(1 for _ in listing())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    row = {
+        "mode": name,
+        "resources": count,
+        "seconds": elapsed,
+        "peak_mb": peak / 2**20,
+        "fetched_mb": fetched_bytes / 2**20,
+    }
+    print(f"{name:>18}: {elapsed * 1000:9.1f} ms  peak {row['peak_mb']:7.1f} MB  fetched {row['fetched_mb']:7.1f} MB")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    db = Database(client=mongomock.MongoClient(), read_cache=None)
+    seed(db, args.size, args.dimensions)
+
+    full_bytes = sum(len(bson.encode(item)) for item in db.db.resources.find())
+    projected_bytes = sum(len(bson.encode(item)) for item in db.db.resources.find({}, RESOURCE_PROJECTION))
+
+    report = [
+        measure("unprojected list", lambda: unprojected_listing(db), full_bytes),
+        measure("get_all_resources", db.get_all_resources, projected_bytes),
+        measure("iter_resources", lambda: db.iter_resources(batch_size=args.batch_size), projected_bytes),
+    ]
+    print(json.dumps({"size": args.size, "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
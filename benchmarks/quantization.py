@@ -0,0 +1,126 @@
+"""Storage, latency and recall benchmark for quantized embedding storage
+
+Compares the float storage of create_resource with the int8 and binary
+modes: BSON size per resource, brute-force candidate-pass latency, and
+recall@k against float search, with binary candidates rescored by their
+int8 vectors as search_resources does.
+
+Usage:
+    python benchmarks/quantization.py [--size 20000] [--queries 200] [--k 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import bson
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantization import quantize_binary, quantize_int8, storage_fields
+from vector_search import make_corpus
+
+
+def bson_size(fields: dict) -> int:
+    document = {
+        "name": "Python Variables Tutorial",
+        "description": "Learn about Python variables and data types",
+        "asset": "https://example.com/python-variables",
+        "resource_type": "video",
+        **fields,
+    }
+    return len(bson.encode(document))
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def recall(expected: list, found: list, k: int) -> float:
+    return statistics.mean(len(set(e) & set(f)) / k for e, f in zip(expected, found))
+
+
+def run_mode(name, queries, score, k, candidates, rescore_matrix=None):
+    """Time a candidate pass (plus optional rescoring) for every query"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        scores = score(query)
+        if rescore_matrix is None:
+            found = top_k(scores, k)
+        else:
+            candidate_ids = top_k(scores, candidates)
+            exact = rescore_matrix[candidate_ids] @ query
+            found = candidate_ids[top_k(exact, k)]
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(found.tolist())
+    return name, results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=3.5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    vectors, queries = make_corpus(args.size, args.queries, args.dimensions, args.clusters, args.noise)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    sizes = {
+        storage: bson_size(storage_fields(vectors[0].tolist(), storage))
+        for storage in ("float", "int8", "binary")
+    }
+
+    int8_matrix = np.stack([quantize_int8(vector) for vector in vectors])
+    # NumPy has no int8 GEMM, so int8 dot products run on a float32 copy of
+    # the quantized values (same scores, BLAS speed)
+    int8_values = int8_matrix.astype(np.float32)
+    int8_float = int8_values / np.linalg.norm(int8_values, axis=1, keepdims=True)
+    bits_matrix = np.stack([quantize_binary(vector) for vector in vectors])
+
+    def hamming_similarity(query):
+        return -np.bitwise_count(bits_matrix ^ quantize_binary(query)).sum(axis=1, dtype=np.int32)
+
+    def int8_similarity(query):
+        return int8_values @ quantize_int8(query).astype(np.float32)
+
+    candidates = args.k * args.rescore_factor
+    runs = [
+        run_mode("float", queries, lambda q: vectors @ q, args.k, candidates),
+        run_mode("int8", queries, int8_similarity, args.k, candidates),
+        run_mode("binary", queries, hamming_similarity, args.k, candidates),
+        run_mode("binary+rescore", queries, hamming_similarity, args.k, candidates, int8_float),
+    ]
+
+    truth = runs[0][1]
+    report = []
+    for name, found, latencies in runs:
+        storage = name.split("+")[0]
+        row = {
+            "mode": name,
+            "bson_bytes_per_resource": sizes[storage],
+            "recall": recall(truth, found, args.k),
+            "p50_ms": statistics.median(latencies),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        }
+        report.append(row)
+        print(
+            f"{name:>15}: {row['bson_bytes_per_resource']:6d} B/resource  "
+            f"recall@{args.k} {row['recall']:.3f}  p50 {row['p50_ms']:.2f} ms  p95 {row['p95_ms']:.2f} ms"
+        )
+
+    print(json.dumps({"size": args.size, "k": args.k, "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
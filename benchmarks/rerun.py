@@ -0,0 +1,83 @@
+"""Rerun latency of the Streamlit pages
+
+Runs each page script with Streamlit's AppTest against a seeded in-memory
+mongomock database and times repeated reruns, which is what every widget
+interaction costs. The chat component is replaced by a no-op so no Parlant
+server is needed.
+
+Pass other copies of the page scripts (e.g. from an older commit) with
+--pages to compare before and after.
+
+Usage:
+    python benchmarks/rerun.py [--roadmaps 20] [--quizzes 200] [--resources 500] [--reruns 20]
+    python benchmarks/rerun.py --pages /tmp/old/1_Roadmap.py /tmp/old/2_Quizzes.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import mongomock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# mongomock has no change streams
+os.environ.setdefault("READ_CACHE_CHANGE_STREAM", "false")
+
+from streamlit.testing.v1 import AppTest
+
+import components.chat
+import database
+from suite import make_quiz, make_resource, make_roadmap
+
+PAGES = ["pages/1_Roadmap.py", "pages/2_Quizzes.py", "pages/3_Resources.py"]
+
+
+def seed(client, roadmaps: int, quizzes: int, resources: int):
+    db = client.ai_tutor_db
+    db.roadmaps.insert_many([make_roadmap(i).model_dump(exclude={"mongo_id"}) for i in range(roadmaps)])
+    db.quizzes.insert_many([make_quiz(i).model_dump(exclude={"mongo_id"}) for i in range(quizzes)])
+    db.resources.insert_many([make_resource(i).model_dump(exclude={"mongo_id"}) for i in range(resources)])
+
+
+def time_reruns(page: str, reruns: int) -> dict:
+    app = AppTest.from_file(page, default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(f"{page} failed: {app.exception[0].message}")
+
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        samples.append(time.perf_counter() - start)
+    return {"page": page, "first_ms": first * 1000, "rerun_ms": statistics.median(samples) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=[os.path.join(ROOT, page) for page in PAGES])
+    parser.add_argument("--roadmaps", type=int, default=20)
+    parser.add_argument("--quizzes", type=int, default=200)
+    parser.add_argument("--resources", type=int, default=500)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    client = mongomock.MongoClient()
+    seed(client, args.roadmaps, args.quizzes, args.resources)
+    database.get_client = lambda: client
+    components.chat.init_chat = lambda agent_id: None
+    components.chat.show_chat = lambda *args, **kwargs: None
+    components.chat.share_context = lambda *args, **kwargs: 0
+
+    for page in args.pages:
+        result = time_reruns(page, args.reruns)
+        print(f"{os.path.basename(page):>16}: first run {result['first_ms']:8.1f} ms  rerun {result['rerun_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Offline benchmark and regression suite for the Database layer
+
+Runs against an in-memory mongomock client with a deterministic hashing
+encoder in place of bge-large, so it needs no Atlas cluster, network or
+model download. For each corpus size it times the create_* methods, the
+get_all_* listings (cold and cached), search_resources (cold, cached and hybrid) and
+update_all_embeddings, and writes the results as JSON.
+
+Passing --baseline compares against an earlier results file and exits
+non-zero when any timing got slower than the allowed tolerance.
+
+Usage:
+    python benchmarks/suite.py [--sizes 100 500 2000] [--output benchmark-results.json]
+    python benchmarks/suite.py --baseline benchmark-results.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import zlib
+
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+
+import mongomock
+import numpy as np
+from mongomock.collection import BulkOperationBuilder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import embeddings
+from database import EMBEDDING_DIMENSIONS, Database
+from embedding_cache import EmbeddingCache
+from models import Quiz, QuizChoice, QuizQuestion, Resource, Roadmap, SubTopic, Topic
+from read_cache import ReadCache
+from search_cache import SearchResultCache
+
+WORDS = (
+    "python loops variables functions classes asyncio pandas groupby lists dictionaries "
+    "recursion generators decorators testing debugging strings files modules packages numpy"
+).split()
+
+QUERIES = ["python loops", "pandas groupby", "asyncio tasks", "testing functions", "numpy arrays"]
+
+
+class HashingEncoder:
+    """Deterministic bag-of-words stand-in for the SentenceTransformer"""
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def encode(self, data):
+        texts = [data] if isinstance(data, str) else list(data)
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                digest = zlib.crc32(token.encode("utf-8"))
+                vectors[row, digest % self.dimensions] += 1.0 if digest & 1 << 16 else -1.0
+        return vectors[0] if isinstance(data, str) else vectors
+
+
+def patch_mongomock_bulk_updates():
+    """mongomock 4.x predates the sort= argument newer pymongo passes to bulk updates"""
+    original = BulkOperationBuilder.add_update
+    if "sort" in original.__code__.co_varnames:
+        return
+
+    def add_update(self, *args, sort=None, **kwargs):
+        return original(self, *args, **kwargs)
+
+    BulkOperationBuilder.add_update = add_update
+
+
+def make_resource(i: int) -> Resource:
+    words = [WORDS[(i * 7 + j) % len(WORDS)] for j in range(4)]
+    return Resource(
+        name=f"{words[0].title()} guide {i}",
+        description=f"Learn {' '.join(words)} step by step",
+        asset=f"https://example.com/resources/{i}",
+        resource_type=["video", "article", "code_example"][i % 3],
+    )
+
+
+def make_roadmap(i: int) -> Roadmap:
+    return Roadmap(
+        title=f"Roadmap {i}",
+        description="Generated for benchmarking",
+        topics=[
+            Topic(name=f"Topic {t}", subtopics=[SubTopic(name=f"Subtopic {t}.{s}") for s in range(8)])
+            for t in range(10)
+        ],
+    )
+
+
+def make_quiz(i: int) -> Quiz:
+    return Quiz(
+        title=f"Quiz {i}",
+        description="Generated for benchmarking",
+        questions=[
+            QuizQuestion(
+                question=f"Question {q}?",
+                choices=[QuizChoice(text=f"Choice {c}", is_correct=c == 0) for c in range(4)],
+                explanation="Because choice 0 is correct",
+            )
+            for q in range(10)
+        ],
+    )
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Median wall time of func over `repeat` runs"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_size(size: int, repeat: int) -> dict:
+    embeddings.embedding_model.use(HashingEncoder())
+    embeddings._cache = EmbeddingCache(None)
+    db = Database(client=mongomock.MongoClient(), vector_backend="local")
+    db.search_cache = SearchResultCache()
+    db.read_cache = ReadCache()
+
+    def uncached(listing):
+        db.read_cache.invalidate_all()
+        return listing()
+
+    documents = max(1, size // 10)
+    metrics = {
+        "create_resource": timed(lambda: [db.create_resource(make_resource(i)) for i in range(size)]) / size,
+        "create_roadmap": timed(lambda: [db.create_roadmap(make_roadmap(i)) for i in range(documents)]) / documents,
+        "create_quiz": timed(lambda: [db.create_quiz(make_quiz(i)) for i in range(documents)]) / documents,
+        "get_all_resources": timed(lambda: uncached(db.get_all_resources), repeat),
+        "get_all_roadmaps": timed(lambda: uncached(db.get_all_roadmaps), repeat),
+        "get_all_quizzes": timed(lambda: uncached(db.get_all_quizzes), repeat),
+        "get_quiz_summaries": timed(lambda: uncached(db.get_quiz_summaries), repeat),
+    }
+    # Served from the read cache filled by the runs above
+    metrics["get_all_roadmaps_cached"] = timed(db.get_all_roadmaps, repeat)
+    metrics["get_all_quizzes_cached"] = timed(db.get_all_quizzes, repeat)
+
+    # The first searches also build the local vector index
+    db.search_cache.invalidate()
+    metrics["search_resources_first"] = timed(
+        lambda: [db.search_resources(query, 5) for query in QUERIES]
+    ) / len(QUERIES)
+    db.search_cache.invalidate()
+    metrics["search_resources"] = timed(
+        lambda: [db.search_resources(query, 5) for query in QUERIES]
+    ) / len(QUERIES)
+    metrics["search_resources_cached"] = timed(
+        lambda: [db.search_resources(query, 5) for query in QUERIES], repeat
+    ) / len(QUERIES)
+
+    # Keyword + vector fusion, with the BM25 index already built
+    db.search_mode = "hybrid"
+    db._get_lexical_index()
+    db.search_cache.invalidate()
+    metrics["search_resources_hybrid"] = timed(
+        lambda: [db.search_resources(query, 5) for query in QUERIES]
+    ) / len(QUERIES)
+    db.search_mode = "vector"
+
+    # Start re-embedding from an empty cache so the encoder actually runs
+    embeddings._cache = EmbeddingCache(None)
+    metrics["update_all_embeddings"] = timed(lambda: db.update_all_embeddings(resume=False))
+    return {"size": size, "roadmaps": documents, "quizzes": documents, "seconds": metrics}
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Timings slower than baseline * (1 + tolerance), matched by corpus size"""
+    previous = {run["size"]: run["seconds"] for run in baseline}
+    regressions = []
+    for run in results:
+        for metric, seconds in run["seconds"].items():
+            before = previous.get(run["size"], {}).get(metric)
+            if before and seconds > before * (1 + tolerance):
+                regressions.append(
+                    f"{metric} at size {run['size']}: {before * 1000:.2f} ms -> {seconds * 1000:.2f} ms"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per read benchmark, median is kept")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # Read the baseline first: it is often the same file as --output
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["runs"]
+
+    patch_mongomock_bulk_updates()
+
+    results = []
+    for size in args.sizes:
+        print(f"Benchmarking {size} resources...")
+        run = run_size(size, args.repeat)
+        for metric, seconds in run["seconds"].items():
+            print(f"  {metric:>24}: {seconds * 1000:10.3f} ms")
+        results.append(run)
+
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "runs": results}, f, indent=2)
+    print(f"Saved results to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Performance regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Recall/latency benchmark for the local vector index
+
+Builds a synthetic clustered corpus of normalised vectors and compares the
+IVF mode of LocalVectorIndex against exact brute-force search.
+
+Usage:
+    python benchmarks/vector_search.py [--size 20000] [--queries 200] [--k 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vector_index import LocalVectorIndex
+
+
+def make_corpus(size: int, queries: int, dimensions: int, clusters: int, noise: float, seed: int = 0):
+    """Gaussian clusters around random centres, with queries drawn the same way"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions)).astype(np.float32)
+
+    def sample(count):
+        points = centers[rng.integers(0, clusters, count)]
+        return points + noise * rng.normal(size=(count, dimensions)).astype(np.float32)
+
+    return sample(size), sample(queries)
+
+
+def time_queries(index: LocalVectorIndex, queries: np.ndarray, k: int, exact: bool):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append([item_id for item_id, _ in index.search(query, k, exact=exact)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=3.5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--probes", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+
+    vectors, queries = make_corpus(args.size, args.queries, args.dimensions, args.clusters, args.noise)
+
+    index = LocalVectorIndex(args.dimensions, mode="ivf")
+    start = time.perf_counter()
+    index.add_many((str(i), vector) for i, vector in enumerate(vectors))
+    build_seconds = time.perf_counter() - start
+    print(f"Indexed {args.size} vectors in {build_seconds:.2f}s ({len(index._lists)} IVF lists)")
+
+    truth, exact_latencies = time_queries(index, queries, args.k, exact=True)
+    report = [{
+        "mode": "exact",
+        "recall": 1.0,
+        "p50_ms": statistics.median(exact_latencies),
+        "p95_ms": float(np.percentile(exact_latencies, 95)),
+    }]
+
+    for probes in args.probes:
+        index.n_probe = probes
+        found, latencies = time_queries(index, queries, args.k, exact=False)
+        recall = statistics.mean(
+            len(set(expected) & set(actual)) / args.k for expected, actual in zip(truth, found)
+        )
+        report.append({
+            "mode": f"ivf n_probe={probes}",
+            "recall": recall,
+            "p50_ms": statistics.median(latencies),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        })
+
+    for row in report:
+        print(f"{row['mode']:>16}: recall@{args.k} {row['recall']:.3f}  p50 {row['p50_ms']:.2f} ms  p95 {row['p95_ms']:.2f} ms")
+    print(json.dumps({"size": args.size, "k": args.k, "build_seconds": build_seconds, "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
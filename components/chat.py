@@ -1,34 +1,161 @@
+import os
+import time
+import httpx
 import streamlit as st
 from parlant.client import ParlantClient
+from parlant.client.core.api_error import ApiError
+
+# How long to wait for the agent to finish replying, and for each long poll
+CHAT_TIMEOUT_SECONDS = int(os.getenv("CHAT_TIMEOUT_SECONDS", "60"))
+CHAT_POLL_SECONDS = int(os.getenv("CHAT_POLL_SECONDS", "10"))
+
+PARLANT_URL = os.getenv("PARLANT_URL", "http://localhost:8800")
+# Kept-alive connections to the Parlant server shared by all browser sessions
+PARLANT_MAX_CONNECTIONS = int(os.getenv("PARLANT_MAX_CONNECTIONS", "20"))
+
+STATUS_LABELS = {
+    "acknowledged": "Thinking...",
+    "processing": "Thinking...",
+    "typing": "Typing...",
+}
+# Statuses after which the agent sends nothing more for this message
+FINAL_STATUSES = ("ready", "error", "cancelled")
+
+@st.cache_resource
+def get_parlant_client() -> ParlantClient:
+    """One ParlantClient for the process, reusing its HTTP connections"""
+    http = httpx.Client(
+        # Long polls hold a connection for up to CHAT_POLL_SECONDS
+        timeout=httpx.Timeout(CHAT_POLL_SECONDS + 30, connect=5),
+        limits=httpx.Limits(
+            max_connections=PARLANT_MAX_CONNECTIONS,
+            max_keepalive_connections=PARLANT_MAX_CONNECTIONS,
+        ),
+    )
+    return ParlantClient(base_url=PARLANT_URL, httpx_client=http)
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def get_agent(agent_id: str):
+    """Agent metadata, fetched once per agent rather than per browser session"""
+    return get_parlant_client().agents.retrieve(agent_id)
+
+def release_customer(customer):
+    """Delete a browser session's Parlant customer, and the context variable values set for it"""
+    try:
+        get_parlant_client().customers.delete(customer.id)
+    except (ApiError, httpx.HTTPError):
+        pass  # Best effort: the server may be down or already have dropped it
+
+@st.cache_resource(scope="session", on_release=release_customer, show_spinner=False)
+def get_customer():
+    """This browser session's Parlant customer, deleted when the session disconnects
+
+    Context variables are stored per customer, so each browser session is one.
+    """
+    return get_parlant_client().customers.create(name="Learner")
 
 def init_chat(agent_id: str):
-    """Initialize chat session state with specific agent ID"""
-    # Always reinitialize messages when switching agents
-    if "current_agent_id" not in st.session_state or st.session_state.current_agent_id != agent_id:
-        st.session_state.messages = []
-        st.session_state.current_agent_id = agent_id
-        
-    if "parlant_session" not in st.session_state:
-        client = ParlantClient(base_url="http://localhost:8800")
-        agent = client.agents.retrieve(agent_id)
-        session = client.sessions.create(agent_id=agent_id, allow_greeting=False)
-        st.session_state.parlant_session = session
-        st.session_state.parlant_client = client
-
-def show_chat(prompt_placeholder: str = "Ask me anything!", extra_info: str = ""):
+    """Initialize chat session state with specific agent ID
+
+    Each agent gets its own Parlant session and message history, kept for
+    the browser session, so switching pages continues the right conversation.
+    """
+    client = get_parlant_client()
+    sessions = st.session_state.setdefault("parlant_sessions", {})
+    histories = st.session_state.setdefault("chat_messages", {})
+
+    customer = get_customer()
+    if getattr(st.session_state.get("parlant_customer"), "id", None) != customer.id:
+        # A new browser session, or its customer was released when the connection dropped
+        st.session_state.parlant_customer = customer
+        sessions.clear()
+        st.session_state.pop("shared_context", None)
+
+    if agent_id not in sessions:
+        sessions[agent_id] = client.sessions.create(
+            agent_id=agent_id,
+            customer_id=st.session_state.parlant_customer.id,
+            allow_greeting=False,
+        )
+        histories[agent_id] = []
+
+    st.session_state.current_agent_id = agent_id
+    st.session_state.parlant_session = sessions[agent_id]
+    st.session_state.parlant_client = client
+    st.session_state.messages = histories[agent_id]
+
+@st.cache_resource(show_spinner=False)
+def get_context_variable(agent_id: str, name: str, description: str):
+    """The agent's context variable called name, created on first use"""
+    client = get_parlant_client()
+    tag = f"agent:{agent_id}"
+    for variable in client.context_variables.list(tag_id=tag):
+        if variable.name == name:
+            return variable
+    return client.context_variables.create(name=name, description=description, tags=[tag])
+
+def share_context(name: str, description: str, value: str) -> int:
+    """Give the current agent value as a context variable of this browser session
+
+    The agent receives it with every turn without it being repeated in the
+    messages. It is only sent again when value changes.
+
+    Returns:
+        Size of the value in bytes
+    """
+    agent_id = st.session_state.current_agent_id
+    sent = st.session_state.setdefault("shared_context", {})
+    if sent.get((agent_id, name)) != value:
+        variable = get_context_variable(agent_id, name, description)
+        get_parlant_client().context_variables.set_value(
+            variable.id, st.session_state.parlant_customer.id, data=value
+        )
+        sent[(agent_id, name)] = value
+    return len(value.encode())
+
+def stream_agent_events(client, session_id: str, min_offset: int, timeout: int = CHAT_TIMEOUT_SECONDS):
+    """Yield the agent's message and status events after min_offset as they arrive
+
+    Long-polls list_events, so each event is yielded as soon as the server has
+    it. Stops once the agent reports it is ready, failed or was cancelled, or
+    after timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    offset = min_offset
+    while (remaining := deadline - time.monotonic()) > 0:
+        try:
+            events = client.sessions.list_events(
+                session_id=session_id,
+                source="ai_agent",
+                kinds="message,status",
+                min_offset=offset,
+                wait_for_data=max(1, min(CHAT_POLL_SECONDS, int(remaining))),
+            )
+        except ApiError as e:
+            if e.status_code == 504:  # Nothing new within wait_for_data
+                continue
+            raise
+        for event in events:
+            offset = max(offset, event.offset + 1)
+            yield event
+            if event.kind == "status" and (event.data or {}).get("status") in FINAL_STATUSES:
+                return
+
+def show_chat(prompt_placeholder: str = "Ask me anything!"):
     """Display chat interface with custom prompt placeholder"""
     st.markdown("---")
-    st.subheader("Chat with AI Tutor")
+    agent = get_agent(st.session_state.current_agent_id)
+    st.subheader(f"Chat with {agent.name}" if agent.name else "Chat with AI Tutor")
     
     # Display chat messages
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
-            st.markdown(message["content"].split("*&()")[0])
+            st.markdown(message["content"])
     
     # Chat input
     if prompt := st.chat_input(prompt_placeholder):
         # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt + f"*&() Use this extra information to provide better context and details: {extra_info}"})
+        st.session_state.messages.append({"role": "user", "content": prompt})
         with st.chat_message("user"):
             st.markdown(prompt)
             
@@ -40,16 +167,34 @@ def show_chat(prompt_placeholder: str = "Ask me anything!", extra_info: str = ""
             message=prompt,
         )
 
-        agent_event, *_ = st.session_state.parlant_client.sessions.list_events(
-            session_id=st.session_state.parlant_session.id,
-            source="ai_agent",
-            kinds="message",
-            min_offset=customer_event.offset,
-        )
-        
-        # Display AI response
-        assert agent_event.data
-        agent_message = agent_event.data["message"]
-        st.session_state.messages.append({"role": "assistant", "content": agent_message})
+        # Show the agent's status and each message as soon as it arrives
         with st.chat_message("assistant"):
-            st.markdown(agent_message)
+            status = st.empty()
+            status.caption("Thinking...")
+            replied = False
+            outcome = None
+            for event in stream_agent_events(
+                st.session_state.parlant_client,
+                st.session_state.parlant_session.id,
+                customer_event.offset + 1,
+            ):
+                data = event.data or {}
+                if event.kind == "message" and data.get("message"):
+                    status.empty()
+                    st.markdown(data["message"])
+                    st.session_state.messages.append({"role": "assistant", "content": data["message"]})
+                    replied = True
+                    status = st.empty()
+                elif event.kind == "status" and data.get("status") in FINAL_STATUSES:
+                    outcome = data["status"]
+                elif event.kind == "status" and data.get("status") in STATUS_LABELS:
+                    status.caption(STATUS_LABELS[data["status"]])
+
+            if outcome == "error":
+                status.error("The tutor ran into a problem. Please try again.")
+            elif replied or outcome == "ready":
+                status.empty()
+            elif outcome == "cancelled":
+                status.info("The tutor stopped before replying. Please ask again.")
+            else:
+                status.warning("The tutor is taking too long to reply. Please try again.")
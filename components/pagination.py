@@ -0,0 +1,24 @@
+import streamlit as st
+
+def current_token(key: str):
+    """Token of the page currently shown for a listing, None for the first page"""
+    tokens = st.session_state.setdefault(f"{key}_page_tokens", [None])
+    return tokens[-1]
+
+def page_controls(key: str, page):
+    """Previous/next buttons that move through a listing's pages"""
+    tokens = st.session_state[f"{key}_page_tokens"]
+    previous_col, position_col, next_col = st.columns([1, 2, 1])
+    with previous_col:
+        if st.button("Previous", key=f"{key}_previous", disabled=len(tokens) == 1):
+            tokens.pop()
+            st.rerun()
+    with position_col:
+        caption = f"Page {len(tokens)}"
+        if page.total_estimate is not None:
+            caption += f" · about {page.total_estimate} in total"
+        st.caption(caption)
+    with next_col:
+        if st.button("Next", key=f"{key}_next", disabled=page.next_token is None):
+            tokens.append(page.next_token)
+            st.rerun()
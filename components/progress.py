@@ -0,0 +1,25 @@
+import streamlit as st
+from progress_tracker import ProgressTracker
+from components.db import get_database
+
+def get_tracker(roadmap_id: str) -> ProgressTracker:
+    """This browser session's unsaved progress on a roadmap"""
+    trackers = st.session_state.setdefault("progress_trackers", {})
+    if roadmap_id not in trackers:
+        trackers[roadmap_id] = ProgressTracker(roadmap_id)
+    return trackers[roadmap_id]
+
+def flush_progress(force: bool = False) -> bool:
+    """Save pending roadmap progress that has settled, or all of it with force
+
+    Pages call this with force when they load, so leaving the Roadmap page
+    saves what was left pending there.
+
+    Returns:
+        True if nothing failed to save
+    """
+    saved = True
+    for tracker in st.session_state.get("progress_trackers", {}).values():
+        if tracker.dirty and (force or tracker.due()):
+            saved = tracker.flush(get_database()) and saved
+    return saved
@@ -0,0 +1,30 @@
+import importlib
+import os
+import sys
+
+import pytest
+from mongomock.collection import BulkOperationBuilder
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+
+@pytest.fixture
+def mongomock_bulk_updates(monkeypatch):
+    """Let mongomock 4.x take the sort= argument newer pymongo passes to bulk updates"""
+    original = BulkOperationBuilder.add_update
+    if "sort" in original.__code__.co_varnames:
+        return
+
+    def add_update(self, *args, sort=None, **kwargs):
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(BulkOperationBuilder, "add_update", add_update)
+
+
+@pytest.fixture
+def suite(monkeypatch):
+    """benchmarks/suite.py, with its settings undone after the test"""
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", "")
+    # Appended: benchmarks/ has modules named like the app's (decoding, quantization)
+    monkeypatch.setattr(sys, "path", sys.path + [BENCHMARKS])
+    return importlib.import_module("suite")
@@ -0,0 +1,55 @@
+import gc
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List
+
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model) -> TypeAdapter:
+    """Pre-built validator for a list of model, shared per model class"""
+    return TypeAdapter(List[model])
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def gc_paused():
+    """Disable the cyclic garbage collector for the duration of the block
+
+    Decoding a large roadmap or quiz listing allocates tens of thousands of
+    small objects, which otherwise triggers repeated collections that scan
+    everything allocated so far.
+
+    The collector is process-wide, so overlapping blocks in other threads
+    (e.g. concurrent Streamlit sessions) share one pause: it starts with the
+    first block and the collector is restored when the last one exits.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def decode_trusted(model, documents: List[dict]) -> list:
+    """Decode documents the app wrote itself in a single validator call
+
+    Meant for reads of data that was already validated on the way in; tool
+    input should keep going through the models directly.
+    """
+    with gc_paused():
+        return list_adapter(model).validate_python(documents)
@@ -0,0 +1,175 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from embeddings import get_embeddings
+
+# How long the first request in a batch waits for others to join it
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "32"))
+# Upper bound on concurrent model.encode calls; the model releases the GIL
+# while encoding, so a couple of threads overlap without oversubscribing the CPU
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "2"))
+
+_STOP = object()
+
+
+class EmbeddingScheduler:
+    """Micro-batches concurrent embedding requests into single forward passes
+
+    Callers submit one text at a time and get a Future back. A worker thread
+    takes the oldest request, waits up to `window_ms` (measured from when that
+    request arrived) for more to queue up, then embeds up to `max_batch_size`
+    texts with one `encode_batch` call and resolves each caller's future.
+    Texts submitted together with submit_many stay in the same batch.
+
+    Args:
+        encode_batch: Function embedding a list of texts
+        window_ms: Maximum time a request waits for a batch to fill
+        max_batch_size: Largest batch sent to the model
+        workers: Number of batches that may be encoded at the same time
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], List[List[float]]] = get_embeddings,
+        window_ms: float = EMBEDDING_BATCH_WINDOW_MS,
+        max_batch_size: int = EMBEDDING_MAX_BATCH,
+        workers: int = EMBEDDING_WORKERS,
+    ):
+        self.encode_batch = encode_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.workers = workers
+        self._queue: "queue.Queue" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.requests = 0
+        self.total_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(target=self._run, name=f"embedding-scheduler-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+
+    def submit(self, text: str) -> Future:
+        """Queue text for embedding; the future resolves to its vector"""
+        return self.submit_many([text])[0]
+
+    def submit_many(self, texts: List[str]) -> List[Future]:
+        """Queue texts to be embedded together, in batches of up to max_batch_size"""
+        self._ensure_started()
+        enqueued = time.perf_counter()
+        requests = [(text, Future(), enqueued) for text in texts]
+        # Each queue item is a group of requests that a worker takes whole
+        for start in range(0, len(requests), self.max_batch_size):
+            self._queue.put(requests[start:start + self.max_batch_size])
+        return [future for _, future, _ in requests]
+
+    def embed(self, text: str) -> List[float]:
+        """Blocking helper for synchronous callers"""
+        return self.submit(text).result()
+
+    def _collect(self, first: list) -> tuple:
+        """Gather requests until the window closes or the batch is full
+
+        Returns:
+            The batch, a group that did not fit into it (or None) and
+            whether shutdown was requested
+        """
+        batch = list(first)
+        deadline = first[0][2] + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                group = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if group is _STOP:
+                return batch, None, True
+            if len(batch) + len(group) > self.max_batch_size:
+                return batch, group, False
+            batch.extend(group)
+        return batch, None, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, overflow, stop = self._collect(first)
+            self._encode(batch)
+            if overflow:
+                self._encode(overflow)
+            if stop:
+                return
+
+    def _encode(self, batch: list):
+        self._record(batch, time.perf_counter())
+        futures = [future for _, future, _ in batch]
+        try:
+            vectors = self.encode_batch([text for text, _, _ in batch])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future, vector in zip(futures, vectors):
+                future.set_result(vector)
+
+    def _record(self, batch: list, started: float):
+        delays = [started - enqueued for _, _, enqueued in batch]
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.total_queue_delay += sum(delays)
+            self.max_queue_delay = max(self.max_queue_delay, *delays)
+
+    def stats(self) -> dict:
+        """Batch fill and queueing delay added by the scheduler"""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "mean_batch_fill": (
+                    self.requests / (self.batches * self.max_batch_size) if self.batches else 0.0
+                ),
+                "mean_queue_delay_ms": (
+                    1000 * self.total_queue_delay / self.requests if self.requests else 0.0
+                ),
+                "max_queue_delay_ms": 1000 * self.max_queue_delay,
+            }
+
+    def shutdown(self):
+        """Stop the worker threads once queued requests are processed"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+
+_scheduler: Optional[EmbeddingScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> EmbeddingScheduler:
+    """Return the process-wide embedding scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = EmbeddingScheduler()
+    return _scheduler
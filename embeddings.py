@@ -0,0 +1,101 @@
+import os
+import threading
+from typing import List, Optional, Union
+
+from dotenv import load_dotenv
+
+from embedding_cache import EmbeddingCache, cache_key
+
+load_dotenv()
+
+MODEL_NAME = "BAAI/bge-large-en-v1.5"
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Set EMBEDDING_CACHE_PATH to an empty string to keep the cache in memory only
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", os.path.join(PROJECT_DIR, "embedding-cache", "embeddings.sqlite3")
+)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+
+
+class EmbeddingModel:
+    """SentenceTransformer wrapper that only loads the model on first use
+
+    Importing sentence_transformers pulls in torch and the model weights take
+    over a gigabyte of RAM, so processes that only read from the database
+    (the Streamlit pages) should never pay for it.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        """Load the model if it has not been loaded yet and return it"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name, trust_remote_code=True)
+        return self._model
+
+    def use(self, model):
+        """Use an already constructed encoder, e.g. a small stub for offline benchmarks"""
+        with self._lock:
+            self._model = model
+
+    def encode(self, data: Union[str, List[str]]):
+        return self.load().encode(data)
+
+
+# Shared instance used by the database layer
+embedding_model = EmbeddingModel()
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache, opening it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(EMBEDDING_CACHE_PATH or None, EMBEDDING_CACHE_SIZE)
+    return _cache
+
+
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """Embed several texts, only running the model on cache misses
+
+    Misses are deduplicated and encoded in a single batch.
+    """
+    cache = get_cache()
+    keys = [cache_key(embedding_model.model_name, text) for text in texts]
+    vectors = [cache.get(key) for key in keys]
+
+    missing = {}
+    for key, text, vector in zip(keys, texts, vectors):
+        if vector is None and key not in missing:
+            missing[key] = text
+
+    if missing:
+        encoded = embedding_model.encode(list(missing.values())).tolist()
+        computed = dict(zip(missing.keys(), encoded))
+        cache.put_many(computed)
+        vectors = [vector if vector is not None else computed[key] for key, vector in zip(keys, vectors)]
+
+    return vectors
+
+
+def get_embedding(data):
+    """Generates vector embeddings for the given data."""
+
+    if isinstance(data, str):
+        return get_embeddings([data])[0]
+    return get_embeddings(list(data))
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import threading
+import time
+from typing import List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.operations import SearchIndexModel
+
+# Collection holding the logical -> physical name of each active search index
+ALIAS_COLLECTION = "search_index_aliases"
+# How long a resolved search index name is reused before it is looked up again
+ALIAS_CACHE_SECONDS = 60
+# How long tombstones of deleted resources are kept for other processes' local indexes
+TOMBSTONE_SECONDS = 7 * 24 * 3600
+
+# Ordinary indexes backing the lookups and sorts in Database
+SECONDARY_INDEXES = {
+    "roadmaps": [
+        IndexModel([("title", ASCENDING)], name="title_1"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_-1__id_-1"),
+    ],
+    "quizzes": [
+        # Keyset pagination and newest-first listings (see pagination.py)
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_-1__id_-1"),
+        IndexModel([("slug", ASCENDING)], name="slug_1"),
+    ],
+    "resources": [
+        IndexModel([("slug", ASCENDING)], name="slug_1"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_-1__id_-1"),
+        # Counts and id lookups for filtered search
+        IndexModel([("resource_type", ASCENDING), ("created_at", DESCENDING)], name="resource_type_1_created_at_-1"),
+    ],
+    "deleted_resources": [
+        # Syncs read recent tombstones; old ones expire
+        IndexModel([("deleted_at", ASCENDING)], name="deleted_at_1", expireAfterSeconds=TOMBSTONE_SECONDS),
+    ],
+}
+
+
+def search_index_specs(dimensions: int, storage: str) -> List[dict]:
+    """Search indexes the resources collection should have"""
+    specs = [{
+        "name": "vector_index",
+        "type": "search",
+        "definition": {
+            "mappings": {
+                "dynamic": True,
+                "fields": {
+                    # Text fields queried by hybrid search
+                    "name": {"type": "string"},
+                    "description": {"type": "string"},
+                    # Pre-filter fields of filtered vector search
+                    "resource_type": {"type": "token"},
+                    "created_at": {"type": "date"},
+                    "embedding": {
+                        "type": "knnVector",
+                        "dimensions": dimensions,
+                        "similarity": "cosine"
+                    }
+                }
+            }
+        },
+    }]
+    if storage != "float":
+        # Quantized BSON vectors need a vectorSearch index; packed bits
+        # are compared by hamming distance, which Atlas exposes as euclidean
+        specs.append({
+            "name": "vector_index_quantized",
+            "type": "vectorSearch",
+            "definition": {
+                "fields": [
+                    {
+                        "type": "vector",
+                        "path": "embedding_int8",
+                        "numDimensions": dimensions,
+                        "similarity": "cosine"
+                    },
+                    {
+                        "type": "vector",
+                        "path": "embedding_bits",
+                        "numDimensions": dimensions,
+                        "similarity": "euclidean"
+                    },
+                    {"type": "filter", "path": "resource_type"},
+                    {"type": "filter", "path": "created_at"}
+                ]
+            },
+        })
+    return specs
+
+
+def physical_name(spec: dict) -> str:
+    """Versioned index name derived from the definition
+
+    A changed definition gets a new name, so it can be built next to the
+    index that is currently serving queries.
+    """
+    payload = json.dumps([spec["type"], spec["definition"]], sort_keys=True)
+    return f"{spec['name']}_{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:8]}"
+
+
+class SearchIndexNames:
+    """Process-wide cache of the physical name behind each logical search index"""
+
+    def __init__(self, ttl_seconds: float = ALIAS_CACHE_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, logical: str) -> Optional[str]:
+        with self._lock:
+            entry = self._names.get(logical)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+            return None
+
+    def _remember(self, logical: str, alias: Optional[dict]) -> str:
+        # Without an alias the index was created before versioned names
+        name = alias["physical"] if alias else logical
+        with self._lock:
+            self._names[logical] = (name, time.monotonic() + self.ttl_seconds)
+        return name
+
+    def resolve(self, db, logical: str) -> str:
+        return self._cached(logical) or self._remember(
+            logical, db[ALIAS_COLLECTION].find_one({"_id": logical})
+        )
+
+    async def resolve_async(self, db, logical: str) -> str:
+        return self._cached(logical) or self._remember(
+            logical, await db[ALIAS_COLLECTION].find_one({"_id": logical})
+        )
+
+    def set(self, db, logical: str, physical: str):
+        db[ALIAS_COLLECTION].update_one(
+            {"_id": logical}, {"$set": {"physical": physical}}, upsert=True
+        )
+        with self._lock:
+            self._names[logical] = (physical, time.monotonic() + self.ttl_seconds)
+
+
+search_index_names = SearchIndexNames()
+
+
+class IndexManager:
+    """Brings the collections' indexes in line with the declared ones
+
+    Secondary indexes are created when missing and rebuilt when their keys
+    or options changed. A search index with a new definition is built under
+    a new versioned name while the current one keeps serving queries; once
+    it is queryable the alias is switched and the old index dropped.
+
+    Args:
+        db: Database handle
+        timeout: Seconds to wait for a search index to become queryable
+        poll_interval: First delay between readiness checks, doubled up to max_poll_interval
+        drain_seconds: Wait before dropping a replaced search index, so processes
+            that cached its name have moved to the new one
+    """
+
+    def __init__(
+        self,
+        db,
+        timeout: float = 600,
+        poll_interval: float = 1,
+        max_poll_interval: float = 30,
+        drain_seconds: float = ALIAS_CACHE_SECONDS,
+    ):
+        self.db = db
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.drain_seconds = drain_seconds
+
+    def ensure_secondary_indexes(self) -> List[str]:
+        """Create missing or changed secondary indexes and return their names"""
+        changed = []
+        for collection_name, models in SECONDARY_INDEXES.items():
+            collection = self.db[collection_name]
+            existing = collection.index_information()
+            missing = []
+            for model in models:
+                document = model.document
+                current = existing.get(document["name"])
+                if current is not None and self._same_index(current, document):
+                    continue
+                if current is not None:
+                    print(f"Rebuilding changed index {collection_name}.{document['name']}")
+                    collection.drop_index(document["name"])
+                missing.append(model)
+            if missing:
+                collection.create_indexes(missing)
+                changed.extend(f"{collection_name}.{model.document['name']}" for model in missing)
+        return changed
+
+    @staticmethod
+    def _same_index(current: dict, document: dict) -> bool:
+        keys = [(field, direction) for field, direction in document["key"].items()]
+        options = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+        return list(current["key"]) == keys and all(
+            current.get(option) == document.get(option) for option in options
+        )
+
+    def ensure_search_index(self, collection_name: str, spec: dict) -> str:
+        """Make the spec's definition the active search index and return its physical name"""
+        collection = self.db[collection_name]
+        logical = spec["name"]
+        target = physical_name(spec)
+        existing = {index["name"]: index for index in collection.list_search_indexes()}
+        active = search_index_names.resolve(self.db, logical)
+
+        if active == target and target in existing:
+            return target
+
+        if target not in existing:
+            print(f"Building search index {target} for {logical}")
+            collection.create_search_index(model=SearchIndexModel(
+                definition=spec["definition"], name=target, type=spec["type"]
+            ))
+        self.wait_until_queryable(collection, target)
+
+        search_index_names.set(self.db, logical, target)
+        print(f"{logical} now served by {target}")
+        if active != target and active in existing:
+            print(f"Dropping previous search index {active} in {self.drain_seconds}s")
+            time.sleep(self.drain_seconds)
+            collection.drop_search_index(active)
+        return target
+
+    def wait_until_queryable(self, collection, name: str):
+        """Poll with exponential backoff until the index is queryable"""
+        deadline = time.monotonic() + self.timeout
+        delay = self.poll_interval
+        while True:
+            indices = list(collection.list_search_indexes(name=name))
+            if indices and indices[0].get("queryable") is True:
+                return
+            if indices and indices[0].get("status") == "FAILED":
+                raise RuntimeError(f"Search index {name} failed to build")
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Search index {name} not queryable after {self.timeout}s")
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+    def ensure_indexes(self, dimensions: int, storage: str) -> dict:
+        """Apply all declared secondary and search indexes"""
+        secondary = self.ensure_secondary_indexes()
+        search = [
+            self.ensure_search_index("resources", spec)
+            for spec in search_index_specs(dimensions, storage)
+        ]
+        return {"secondary_created": secondary, "search_indexes": search}
@@ -0,0 +1,123 @@
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Container, Iterable, List, Optional, Sequence, Tuple
+
+# Constant of reciprocal-rank fusion: larger values flatten the bonus of top ranks
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """In-process BM25 inverted index over resource names and descriptions
+
+    Used by hybrid search with the local vector backend; the Atlas backend
+    queries Atlas Search instead. Safe to search while other threads add
+    resources.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)  # term -> {id: term frequency}
+        self._lengths = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._lengths)
+
+    def add(self, item_id: str, text: str):
+        self.add_many([(item_id, text)])
+
+    def add_many(self, items: Iterable[Tuple[str, str]]):
+        # Tokenize outside the lock so searches only wait for the index update
+        tokenized = [(item_id, tokenize(text)) for item_id, text in items]
+        with self._lock:
+            for item_id, tokens in tokenized:
+                if item_id in self._lengths:
+                    continue
+                for term, count in Counter(tokens).items():
+                    self._postings[term][item_id] = count
+                self._lengths[item_id] = len(tokens)
+                self._total_length += len(tokens)
+
+    def remove_many(self, item_ids: Iterable[str]):
+        """Drop documents by id, e.g. of deleted or edited resources"""
+        with self._lock:
+            removed = {item_id for item_id in item_ids if item_id in self._lengths}
+            if not removed:
+                return
+            for item_id in removed:
+                self._total_length -= self._lengths.pop(item_id)
+            for term in list(self._postings):
+                postings = self._postings[term]
+                for item_id in removed.intersection(postings):
+                    del postings[item_id]
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, query: str, k: int, allowed: Optional[Container[str]] = None) -> List[Tuple[str, float]]:
+        """Top k (id, score) pairs for the query terms
+
+        Args:
+            allowed: Only rank these ids, e.g. the resources matching a search filter
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if not self._lengths:
+                return []
+            documents = len(self._lengths)
+            average_length = self._total_length / documents
+            scores = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for item_id, count in postings.items():
+                    if allowed is not None and item_id not in allowed:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[item_id] / average_length)
+                    scores[item_id] += idf * count * (self.k1 + 1) / (count + norm)
+        return sorted(scores.items(), key=lambda hit: hit[1], reverse=True)[:k]
+
+
+def is_strong_match(query: str, resources: Sequence, limit: int) -> bool:
+    """Whether keyword hits alone answer the query
+
+    True when there are enough hits, each contains every query term and the
+    top hit has them in its name, so embedding the query would not change
+    the answer much.
+    """
+    terms = set(tokenize(query))
+    if not terms or len(resources) < limit:
+        return False
+    if not terms <= set(tokenize(resources[0].name)):
+        return False
+    return all(terms <= set(tokenize(f"{item.name} {item.description}")) for item in resources[:limit])
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence], limit: int, k: int = RRF_K) -> List:
+    """Merge ranked resource lists, scoring each by the sum of 1 / (k + rank)"""
+    scores = defaultdict(float)
+    resources = {}
+    for ranking in rankings:
+        for rank, resource in enumerate(ranking, start=1):
+            key = str(resource.mongo_id)
+            scores[key] += 1 / (k + rank)
+            resources.setdefault(key, resource)
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [resources[key] for key in ordered[:limit]]
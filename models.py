@@ -37,6 +37,8 @@ class Roadmap(BaseModel):
     description: str = ""
     topics: List[Topic]
     created_at: datetime = Field(default_factory=datetime.now)
+    # Changes with every save, so edits based on an older copy can be detected
+    revision: str = ""
     mongo_id: Optional[PyObjectId] = None
 
     class Config:
@@ -67,6 +69,14 @@ class Quiz(BaseModel):
             ObjectId: str
         }
 
+class QuizSummary(BaseModel):
+    """Listing entry for a quiz without its questions"""
+    title: str
+    description: str = ""
+    question_count: int = 0
+    created_at: datetime = Field(default_factory=datetime.now)
+    mongo_id: Optional[PyObjectId] = None
+
 class Resource(BaseModel):
     name: str
     description: str
@@ -79,4 +89,13 @@ class Resource(BaseModel):
         arbitrary_types_allowed = True
         json_encoders = {
             ObjectId: str
-        }
\ No newline at end of file
+        }
+
+
+class ScoredResource(Resource):
+    """Search result with its similarity score
+
+    The score is in [0, 1], higher is closer; it is None for hits found only
+    by keyword search.
+    """
+    score: Optional[float] = None
@@ -1,16 +1,17 @@
 import streamlit as st
-from database import Database
 from models import Roadmap, Topic, SubTopic
 from datetime import datetime
 from components.chat import init_chat, show_chat
+from components.db import get_database
+from components.pagination import current_token, page_controls
+from components.progress import flush_progress, get_tracker
+from progress_tracker import AUTOSAVE_SECONDS
 
-# Initialize database
-db = Database()
+# Shared by every session, see components/db.py
+db = get_database()
 
 def init_session_state():
     """Initialize session state variables"""
-    if "checkbox_states" not in st.session_state:
-        st.session_state.checkbox_states = {}
     if "show_topic_creator" not in st.session_state:
         st.session_state.show_topic_creator = False
     if "show_subtopic_creator" not in st.session_state:
@@ -19,35 +20,30 @@ def init_session_state():
     # Initialize chat with roadmap agent
     init_chat("w5HbpNTL14")
 
-def get_all_roadmaps():
-    """Get all available roadmaps"""
-    return db.get_all_roadmaps()
-
 def save_progress(roadmap: Roadmap):
-    """Save progress by updating the roadmap"""
+    """Save the pending progress on a roadmap now"""
     try:
-        # Create a copy of the roadmap to avoid modifying the original
-        roadmap_data = roadmap.model_dump()
-        updated_roadmap = Roadmap.model_validate(roadmap_data)
-        
-        # Update subtopic completion status from session state
-        for topic in updated_roadmap.topics:
-            for subtopic in topic.subtopics:
-                checkbox_key = f"checkbox_{subtopic.name}"
-                if checkbox_key in st.session_state.checkbox_states:
-                    subtopic.completed = st.session_state.checkbox_states[checkbox_key]
-            # Update topic completion based on subtopics
-            topic.completed = all(subtopic.completed for subtopic in topic.subtopics)
-        
-        # Save updated roadmap
-        return db.update_roadmap(str(roadmap.mongo_id), updated_roadmap)
+        return get_tracker(str(roadmap.mongo_id)).flush(db)
     except Exception as e:
         st.error(f"Error saving progress: {str(e)}")
         return False
 
-def toggle_checkbox(key):
-    """Toggle checkbox without triggering rerun"""
-    st.session_state.checkbox_states[key] = not st.session_state.checkbox_states.get(key, False)
+def record_progress(roadmap: Roadmap, topic_index: int, subtopic_index: int, checkbox_key: str):
+    """Remember a checkbox change; autosave writes it after the debounce interval"""
+    get_tracker(str(roadmap.mongo_id)).record(roadmap, topic_index, subtopic_index, st.session_state[checkbox_key])
+
+@st.fragment(run_every=AUTOSAVE_SECONDS)
+def autosave(roadmap: Roadmap):
+    """Save settled progress changes and show whether everything is saved"""
+    tracker = get_tracker(str(roadmap.mongo_id))
+    if tracker.due() and not save_progress(roadmap):
+        st.caption("Couldn't save your progress, retrying...")
+    elif tracker.discarded:
+        st.caption("This roadmap was deleted, so your latest progress wasn't saved")
+    elif tracker.dirty:
+        st.caption("Saving...")
+    else:
+        st.caption("All progress saved")
 
 def create_topic_form(roadmap: Roadmap):
     """Show form to create a new topic"""
@@ -63,10 +59,13 @@ def create_topic_form(roadmap: Roadmap):
                     subtopics=[],
                     completed=False
                 )
-                roadmap.topics.append(new_topic)
+                # Edit the stored roadmap, which may be newer than the one shown
+                roadmap = db.get_roadmap(str(roadmap.mongo_id)) or roadmap
+                updated_roadmap = roadmap.model_copy(deep=True)
+                updated_roadmap.topics.append(new_topic)
                 
                 # Save roadmap
-                if db.update_roadmap(str(roadmap.mongo_id), roadmap):
+                if db.update_roadmap_changes(str(roadmap.mongo_id), roadmap, updated_roadmap):
                     st.success("Topic created successfully!")
                     st.session_state.show_topic_creator = False
                     st.rerun()
@@ -75,9 +74,9 @@ def create_topic_form(roadmap: Roadmap):
             else:
                 st.error("Please fill in all fields.")
 
-def create_subtopic_form(roadmap: Roadmap, parent_topic: Topic):
+def create_subtopic_form(roadmap: Roadmap, parent_topic: Topic, topic_index: int):
     """Show form to create a new subtopic"""
-    with st.form(key=f"new_subtopic_form_{parent_topic.name}"):
+    with st.form(key=f"new_subtopic_form_{topic_index}"):
         st.subheader(f"Create New Subtopic in {parent_topic.name}")
         name = st.text_input("Subtopic Name")
         
@@ -89,14 +88,14 @@ def create_subtopic_form(roadmap: Roadmap, parent_topic: Topic):
                     completed=False
                 )
                 
-                # Find parent topic and add subtopic
-                for topic in roadmap.topics:
-                    if topic.name == parent_topic.name:
-                        topic.subtopics.append(new_subtopic)
-                        break
+                # Edit the stored roadmap, which may be newer than the one shown
+                roadmap = db.get_roadmap(str(roadmap.mongo_id)) or roadmap
+                # Add the subtopic to its parent topic
+                updated_roadmap = roadmap.model_copy(deep=True)
+                updated_roadmap.topics[topic_index].subtopics.append(new_subtopic)
                 
                 # Save roadmap
-                if db.update_roadmap(str(roadmap.mongo_id), roadmap):
+                if db.update_roadmap_changes(str(roadmap.mongo_id), roadmap, updated_roadmap):
                     st.success("Subtopic created successfully!")
                     st.session_state.show_subtopic_creator = None
                     st.rerun()
@@ -106,40 +105,42 @@ def create_subtopic_form(roadmap: Roadmap, parent_topic: Topic):
                 st.error("Please fill in all fields.")
 
 @st.fragment()
-def display_topic(topic: Topic, roadmap: Roadmap):
+def display_topic(topic: Topic, topic_index: int, roadmap: Roadmap):
     """Display a single topic and its subtopics"""
-    # Display subtopics
-    for subtopic in topic.subtopics:
-        checkbox_key = f"checkbox_{subtopic.name}"
-        
-        # Initialize checkbox state if not exists
-        if checkbox_key not in st.session_state.checkbox_states:
-            st.session_state.checkbox_states[checkbox_key] = subtopic.completed
+    roadmap_id = str(roadmap.mongo_id)
+    tracker = get_tracker(roadmap_id)
 
+    # Display subtopics, keyed by position so same-named subtopics don't collide
+    for subtopic_index, subtopic in enumerate(topic.subtopics):
+        checkbox_key = f"progress_{roadmap_id}_{topic_index}_{subtopic_index}"
         st.checkbox(
             label=subtopic.name,
-            value=st.session_state.checkbox_states[checkbox_key],
+            value=tracker.completed(roadmap, topic_index, subtopic_index),
             key=checkbox_key,
-            on_change=toggle_checkbox,
-            args=(checkbox_key,),
+            on_change=record_progress,
+            args=(roadmap, topic_index, subtopic_index, checkbox_key),
         )
 
-    if st.button("Add Subtopic", key=f"add_subtopic_{topic.name}", help="Add new subtopic"):
-        st.session_state.show_subtopic_creator = topic.name
+    if st.button("Add Subtopic", key=f"add_subtopic_{topic_index}", help="Add new subtopic"):
+        st.session_state.show_subtopic_creator = topic_index
 
-    if st.session_state.show_subtopic_creator == topic.name:
-        create_subtopic_form(roadmap, topic)
+    if st.session_state.show_subtopic_creator == topic_index:
+        create_subtopic_form(roadmap, topic, topic_index)
 
 def show_roadmap():
     st.title("Learning Roadmap")
     
     # Initialize session state
     init_session_state()
+    flush_progress()
     
-    roadmaps = get_all_roadmaps()
+    # One page of roadmaps; the controls at the bottom move between pages
+    page = db.page_roadmaps(token=current_token("roadmaps"), count=True)
+    roadmaps = page.items
     
     if not roadmaps:
         st.warning("No roadmaps available. Please check your database connection.")
+        page_controls("roadmaps", page)
         return
     
     # If we have multiple roadmaps, let user select one
@@ -158,23 +159,28 @@ def show_roadmap():
         st.write(selected_roadmap.description)
     
     # Display topics
-    for topic in selected_roadmap.topics:
+    for topic_index, topic in enumerate(selected_roadmap.topics):
         with st.expander(topic.name, expanded=True):
-            display_topic(topic, selected_roadmap)
+            display_topic(topic, topic_index, selected_roadmap)
 
     if st.button("Add Topic", key="add_topic", help="Add new topic"):
         st.session_state.show_topic_creator = True
 
     if st.button("Save Progress", type="primary"):
-        if save_progress(selected_roadmap):
-            st.success("Progress saved successfully!")
-        else:
+        if not save_progress(selected_roadmap):
             st.error("Failed to save progress. Please try again.")
+        elif get_tracker(str(selected_roadmap.mongo_id)).discarded:
+            st.warning("This roadmap was deleted, so your latest progress wasn't saved.")
+        else:
+            st.success("Progress saved successfully!")
+    autosave(selected_roadmap)
     
     # Show topic creator if requested
     if st.session_state.show_topic_creator:
         create_topic_form(selected_roadmap)
     
+    page_controls("roadmaps", page)
+    
     # Show chat interface at the bottom
     show_chat()
 
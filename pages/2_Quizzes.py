@@ -1,10 +1,13 @@
 import streamlit as st
-from database import Database
 from models import Quiz
-from components.chat import init_chat, show_chat
+from roadmap_context import estimate_tokens, roadmap_summary
+from components.chat import init_chat, show_chat, share_context
+from components.db import get_database
+from components.pagination import current_token, page_controls
+from components.progress import flush_progress
 
-# Initialize database
-db = Database()
+# Shared by every session, see components/db.py
+db = get_database()
 
 def init_session_state():
     """Initialize session state variables"""
@@ -17,33 +20,8 @@ def init_session_state():
     
     # Initialize chat with quiz agent
     init_chat("dkJPs3GbXG")
-
-def format_roadmap_info(roadmap):
-    """Format roadmap information into a detailed string"""
-    if not roadmap:
-        return ""
-    
-    # Format topics and subtopics
-    topics_info = []
-    for topic in roadmap.topics:
-        topic_info = f"\nTopic: {topic.name}\n"
-        
-        if topic.subtopics:
-            topic_info += "Subtopics:\n"
-            for subtopic in topic.subtopics:
-                completion_status = "Yes" if subtopic.completed else "No"
-                topic_info += f"- {subtopic.name} - Completed: {completion_status}\n"
-        
-        topics_info.append(topic_info)
-    
-    # Create formatted string
-    info = f"""
-        Roadmap: {roadmap.title}
-        Description: {roadmap.description}
-
-        Topics:{' '.join(topics_info)}
-        """
-    return info
+    # Save roadmap progress left pending on the Roadmap page
+    flush_progress(force=True)
 
 def display_quiz(quiz: Quiz):
     """Display a quiz and handle responses"""
@@ -129,34 +107,47 @@ def show_quizzes():
     ])
     
     with quiz_tab:
-        # Get all quizzes from database
-        quizzes = db.get_all_quizzes()
+        # List a page of quiz summaries; questions are loaded only for the selected quiz
+        page = db.page_quizzes(token=current_token("quizzes"), count=True)
+        summaries = page.items
         
-        if not quizzes:
+        if not summaries:
             st.info("No quizzes available yet. Generate one from a roadmap!")
         else:
             # Quiz selection
-            quiz_titles = [quiz.title for quiz in quizzes]
-            selected_title = st.selectbox(
+            selected_summary = st.selectbox(
                 "Select Quiz",
-                quiz_titles
+                summaries,
+                format_func=lambda summary: f"{summary.title} ({summary.question_count} questions)"
             )
             
-            if selected_title:
-                selected_quiz = next(q for q in quizzes if q.title == selected_title)
-                display_quiz(selected_quiz)
+            if selected_summary:
+                selected_quiz = db.get_quiz(selected_summary.mongo_id)
+                if selected_quiz:
+                    display_quiz(selected_quiz)
+                else:
+                    st.warning("This quiz is no longer available.")
+        
+        # Also shown on an empty page so the user can go back
+        page_controls("quizzes", page)
     
     with generate_tab:
         # Show roadmap selector first
         show_roadmap_selector()
         
-        # Get roadmap info if one is selected
-        roadmap_info = format_roadmap_info(st.session_state.selected_roadmap)
+        # Share a compact summary of the selected roadmap with the quiz agent
+        if st.session_state.selected_roadmap:
+            summary = roadmap_summary(st.session_state.selected_roadmap)
+            size = share_context(
+                "roadmap_progress",
+                "The roadmap the learner selected and their progress through it",
+                summary,
+            )
+            st.caption(f"Roadmap context: {size} bytes (~{estimate_tokens(summary)} tokens)")
         
         # Show chat with roadmap context
         show_chat(
-            prompt_placeholder="Describe what you want to generate a quiz about!",
-            extra_info=roadmap_info
+            prompt_placeholder="Describe what you want to generate a quiz about!"
         )
 
 if __name__ == "__main__":
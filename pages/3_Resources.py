@@ -1,31 +1,37 @@
 import streamlit as st
-from database import Database
 from models import Resource
 from datetime import datetime
 from components.chat import init_chat, show_chat
+from components.db import get_database
+from components.pagination import current_token, page_controls
+from components.progress import flush_progress
 
-# Initialize database
-db = Database()
+# Shared by every session, see components/db.py
+db = get_database()
 
 def init_session_state():    
     # Initialize chat with resources agent
     init_chat("QWODNTNOhX")
+    # Save roadmap progress left pending on the Roadmap page
+    flush_progress(force=True)
 
 def display_resources():
-    """Display all resources"""
-    resources = db.get_all_resources()
+    """Display a page of resources"""
+    page = db.page_resources(token=current_token("resources"), count=True)
     
-    if not resources:
-        st.info("No resources available yet. Add some using the form below!")
-        return
-    
-    # Group resources by type
+    # Group the page's resources by type
     resources_by_type = {}
-    for resource in resources:
+    for resource in page.items:
         if resource.resource_type.lower() not in resources_by_type:
             resources_by_type[resource.resource_type.lower()] = []
         resources_by_type[resource.resource_type.lower()].append(resource)
     
+    if not resources_by_type:
+        st.info("No resources available yet. Add some using the form below!")
+        # A later page can come back empty once resources are deleted
+        page_controls("resources", page)
+        return
+    
     # Display resources by type
     for resource_type, type_resources in resources_by_type.items():
         st.header(resource_type.title())
@@ -35,6 +41,8 @@ def display_resources():
                 if resource.asset:
                     st.write(f"Link: {resource.asset}")
                 st.caption(f"Added on: {resource.created_at.strftime('%Y-%m-%d')}")
+    
+    page_controls("resources", page)
 
 def main():
     st.title("Learning Resources")
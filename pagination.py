@@ -0,0 +1,88 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pydantic import BaseModel
+
+from decoding import decode_trusted
+
+# Items per page when the caller doesn't ask for a size, and the most it may ask for
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+# Newest first; _id breaks ties between documents created in the same millisecond
+PAGE_SORT = {"created_at": -1, "_id": -1}
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a listing
+
+    Pass next_token back to get the following page; it is None on the last one.
+    """
+    items: List[T]
+    next_token: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+def encode_token(document: dict) -> str:
+    """Opaque continuation token pointing just after document"""
+    payload = json.dumps([document["created_at"].isoformat(), str(document["_id"])])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> tuple:
+    """The (created_at, _id) position stored in a token
+
+    Raises:
+        ValueError: If the token wasn't produced by encode_token
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), ObjectId(document_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid page token") from e
+
+
+def page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def page_pipeline(projection: dict, limit: int, token: Optional[str] = None) -> List[dict]:
+    """Aggregation for one keyset page, fetching one extra document to detect the end
+
+    Seeks from the token position on the (created_at, _id) index instead of
+    skipping, so late pages cost the same as the first.
+    """
+    pipeline = []
+    if token:
+        created_at, document_id = decode_token(token)
+        pipeline.append({"$match": {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": document_id}},
+        ]}})
+    pipeline += [
+        {"$sort": PAGE_SORT},
+        {"$limit": limit + 1},
+        {"$project": {**projection, "created_at": 1}},
+    ]
+    return pipeline
+
+
+def build_page(model, documents: List[dict], limit: int, trusted: bool = True) -> Page:
+    """Page of models from the documents returned by page_pipeline"""
+    next_token = encode_token(documents[limit - 1]) if len(documents) > limit else None
+    documents = documents[:limit]
+    for item in documents:
+        item['mongo_id'] = str(item.pop('_id'))
+    if trusted:
+        items = decode_trusted(model, documents)
+    else:
+        items = [model.model_validate(item) for item in documents]
+    return Page[model](items=items, next_token=next_token)
@@ -0,0 +1,100 @@
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from models import Roadmap
+
+# Seconds without a new change before pending progress is saved
+AUTOSAVE_SECONDS = float(os.getenv("AUTOSAVE_SECONDS", "3"))
+
+
+class ProgressTracker:
+    """Subtopic completion changes of one roadmap that are not saved yet
+
+    Subtopics are identified by their (topic, subtopic) positions, which
+    stay stable because topics and subtopics are only ever appended.
+    Changes are saved together once none has been made for
+    debounce_seconds, or whenever flush is called.
+
+    The changes are diffed against the roadmap they were made on, so saving
+    needs no extra read; the roadmap is only re-read when the save finds it
+    was changed in the meantime (see Database.update_roadmap_changes).
+    """
+
+    def __init__(self, roadmap_id: str, debounce_seconds: float = AUTOSAVE_SECONDS, clock=time.monotonic):
+        self.roadmap_id = roadmap_id
+        self.debounce_seconds = debounce_seconds
+        self._clock = clock
+        self._pending: Dict[Tuple[int, int], bool] = {}
+        self._changed_at = 0.0
+        self._base: Optional[Roadmap] = None
+        # Set when changes were dropped because the roadmap no longer exists
+        self.discarded = False
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def due(self) -> bool:
+        """Whether pending changes have settled for the debounce interval"""
+        return self.dirty and self._clock() - self._changed_at >= self.debounce_seconds
+
+    def completed(self, roadmap: Roadmap, topic_index: int, subtopic_index: int) -> bool:
+        """Completion of a subtopic including unsaved changes"""
+        stored = roadmap.topics[topic_index].subtopics[subtopic_index].completed
+        return self._pending.get((topic_index, subtopic_index), stored)
+
+    def record(self, roadmap: Roadmap, topic_index: int, subtopic_index: int, completed: bool):
+        """Note a change to one subtopic of roadmap as shown to the user
+
+        Changes that end where the stored roadmap already is are dropped
+        when flushing, as they produce no update.
+        """
+        if self._base is None:
+            self._base = roadmap
+        self.discarded = False
+        self._pending[(topic_index, subtopic_index)] = completed
+        self._changed_at = self._clock()
+
+    def apply(self, roadmap: Roadmap) -> Roadmap:
+        """Copy of roadmap with the pending changes and the completion of their topics"""
+        edited = roadmap.model_copy(deep=True)
+        touched = set()
+        for (topic_index, subtopic_index), completed in self._pending.items():
+            if topic_index < len(edited.topics) and subtopic_index < len(edited.topics[topic_index].subtopics):
+                edited.topics[topic_index].subtopics[subtopic_index].completed = completed
+                touched.add(topic_index)
+        for topic_index in touched:
+            topic = edited.topics[topic_index]
+            topic.completed = all(subtopic.completed for subtopic in topic.subtopics)
+        return edited
+
+    def flush(self, db) -> bool:
+        """Save the pending changes in one batched write
+
+        Returns:
+            True if nothing is left to save, including when the roadmap was
+            deleted and the changes were discarded (see `discarded`)
+        """
+        if not self._pending:
+            return True
+        if self._base is not None and self._save(db, self._base):
+            return True
+        # Changed since the page read it: retry against the stored roadmap
+        current = db.get_roadmap(self.roadmap_id)
+        if current is None:
+            self._pending.clear()
+            self._base = None
+            self.discarded = True
+            return True
+        self._base = current
+        return self._save(db, current)
+
+    def _save(self, db, roadmap: Roadmap) -> bool:
+        edited = self.apply(roadmap)
+        if not db.update_roadmap_changes(self.roadmap_id, roadmap, edited):
+            return False
+        self._pending.clear()
+        # Carries the new revision, so the next save needs no read either
+        self._base = edited
+        return True
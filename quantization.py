@@ -0,0 +1,87 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+
+# Field holding each storage representation
+FLOAT_FIELD = "embedding"
+INT8_FIELD = "embedding_int8"
+BITS_FIELD = "embedding_bits"
+
+
+def quantize_int8(vector: Sequence[float]) -> np.ndarray:
+    """Scalar-quantize a vector to int8 using its own max magnitude
+
+    The per-vector scale is dropped; cosine similarity does not depend on it.
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    scale = float(np.max(np.abs(vector))) or 1.0
+    return np.round(vector / scale * 127).astype(np.int8)
+
+
+def quantize_binary(vector: Sequence[float]) -> np.ndarray:
+    """Sign-quantize a vector to one bit per dimension, packed into bytes"""
+    return np.packbits(np.asarray(vector) > 0)
+
+
+def int8_vector(vector: Sequence[float]) -> Binary:
+    return Binary.from_vector(quantize_int8(vector).tolist(), BinaryVectorDtype.INT8)
+
+
+def bits_vector(vector: Sequence[float]) -> Binary:
+    return Binary.from_vector(quantize_binary(vector).tolist(), BinaryVectorDtype.PACKED_BIT)
+
+
+def storage_fields(vector: List[float], storage: str) -> dict:
+    """Fields to store for an embedding in the given storage mode
+
+    Binary mode also keeps the int8 vector so its candidates can be rescored.
+    """
+    if storage == "float":
+        return {FLOAT_FIELD: vector}
+    if storage == "int8":
+        return {INT8_FIELD: int8_vector(vector)}
+    if storage == "binary":
+        return {BITS_FIELD: bits_vector(vector), INT8_FIELD: int8_vector(vector)}
+    raise ValueError(f"Unknown embedding storage mode: {storage}")
+
+
+def decode_embedding(document: dict) -> Optional[np.ndarray]:
+    """Best available float32 vector for a stored resource, or None"""
+    if document.get(FLOAT_FIELD) is not None:
+        return np.asarray(document[FLOAT_FIELD], dtype=np.float32)
+    if document.get(INT8_FIELD) is not None:
+        return np.asarray(document[INT8_FIELD].as_vector().data, dtype=np.float32)
+    return None
+
+
+def query_vector(vector: List[float], storage: str):
+    """Query vector in the representation stored for the given mode"""
+    if storage == "int8":
+        return int8_vector(vector)
+    if storage == "binary":
+        return bits_vector(vector)
+    return vector
+
+
+def rescore(query: List[float], documents: List[dict], limit: int) -> List[dict]:
+    """Re-rank binary-mode candidates by cosine between the float query and their int8 vectors
+
+    The int8 vector is far more precise than the sign bits the candidates
+    were found with; candidates without one keep their order at the end.
+    """
+    query = np.array(query, dtype=np.float32)  # a copy, normalised below
+    query /= np.linalg.norm(query) or 1.0
+
+    scored = []
+    for position, document in enumerate(documents):
+        vector = decode_embedding(document)
+        if vector is None:
+            score = float("-inf")
+        else:
+            score = float(vector @ query / (np.linalg.norm(vector) or 1.0))
+            document["score"] = (1 + score) / 2  # same scale as Atlas cosine scores
+        scored.append((score, -position, document))
+
+    scored.sort(key=lambda entry: entry[:2], reverse=True)
+    return [document for _, _, document in scored[:limit]]
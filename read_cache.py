@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, NamedTuple, Union
+
+from pydantic import BaseModel
+
+from decoding import decode_trusted
+
+READ_CACHE_TTL_SECONDS = float(os.getenv("READ_CACHE_TTL_SECONDS", "60"))
+# Entries kept at most; the least recently used are evicted first
+READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", "512"))
+# Listen to a change stream so writes from other processes invalidate too
+READ_CACHE_CHANGE_STREAM = os.getenv("READ_CACHE_CHANGE_STREAM", "true").lower() == "true"
+
+CACHED_COLLECTIONS = ("roadmaps", "quizzes", "resources")
+
+
+class Snapshot(NamedTuple):
+    """Plain-data copy of a model, or of a tuple of models of one type"""
+    model: type
+    data: Union[dict, list]
+    many: bool = False
+
+
+def snapshot(value):
+    """Store models, also inside tuples, as snapshots"""
+    if isinstance(value, BaseModel):
+        return Snapshot(type(value), value.model_dump())
+    if isinstance(value, tuple):
+        if value and isinstance(value[0], BaseModel) and all(type(item) is type(value[0]) for item in value):
+            return Snapshot(type(value[0]), [item.model_dump() for item in value], many=True)
+        return tuple(snapshot(item) for item in value)
+    return value
+
+
+def restore(value):
+    """Fresh models from snapshot()
+
+    Listings are rebuilt with one batched validator call (see decoding.py),
+    the cheapest way to get independent pydantic models: a Python-level copy
+    or model_construct is several times slower for nested models.
+    """
+    if isinstance(value, Snapshot):
+        if value.many:
+            return tuple(decode_trusted(value.model, value.data))
+        return value.model.model_validate(value.data)
+    if isinstance(value, tuple):
+        return tuple(restore(item) for item in value)
+    return value
+
+
+class ReadCache:
+    """Read-through cache for listings and single-document gets
+
+    Each collection has a version number. Writes made through Database bump
+    it, as do change-stream events when a listener is running; entries from
+    an older version are never served. The TTL is the fallback for writes
+    nobody reported. At most max_entries are kept, evicting the least
+    recently used, and stale entries are dropped when they are looked up.
+
+    Entries are shared by every caller in the process (e.g. all Streamlit
+    sessions), so models are stored as plain-data snapshots and every
+    caller gets its own instances, which it may edit freely.
+    """
+
+    def __init__(self, ttl_seconds: float = READ_CACHE_TTL_SECONDS, max_entries: int = READ_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._versions = {collection: 0 for collection in CACHED_COLLECTIONS}
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, collection: str, key: Hashable, load: Callable):
+        """Return the cached value for key, calling load() on a miss"""
+        found, value, version = self._lookup(collection, key)
+        if found:
+            return restore(value)
+        value = load()
+        self._store(collection, key, version, value)
+        return value
+
+    async def get_or_load_async(self, collection: str, key: Hashable, load: Callable):
+        """Like get_or_load, for a load() coroutine function"""
+        found, value, version = self._lookup(collection, key)
+        if found:
+            return restore(value)
+        value = await load()
+        self._store(collection, key, version, value)
+        return value
+
+    def _lookup(self, collection: str, key: Hashable):
+        with self._lock:
+            version = self._versions[collection]
+            entry = self._entries.get((collection, key))
+            if entry is not None:
+                if entry[0] == version and entry[1] > time.monotonic():
+                    self._entries.move_to_end((collection, key))
+                    self.hits += 1
+                    return True, entry[2], version
+                del self._entries[(collection, key)]
+            self.misses += 1
+            return False, None, version
+
+    def _store(self, collection: str, key: Hashable, version: int, value):
+        with self._lock:
+            # Don't store a value read while a write was being applied
+            if self._versions[collection] == version:
+                self._entries[(collection, key)] = (version, time.monotonic() + self.ttl_seconds, snapshot(value))
+                self._entries.move_to_end((collection, key))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str):
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+            for key in [key for key in self._entries if key[0] == collection]:
+                del self._entries[key]
+
+    def invalidate_all(self):
+        for collection in list(self._versions):
+            self.invalidate(collection)
+
+    def watch(self, db, collections: Iterable[str] = CACHED_COLLECTIONS):
+        """Start a background change-stream listener for db, once per cache
+
+        Change streams need a replica set (Atlas has one); where they are
+        unavailable the listener stops and the TTL bounds staleness.
+        """
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(
+                target=self._watch, args=(db, list(collections)), name="read-cache-watch", daemon=True
+            )
+        self._watcher.start()
+
+    def _watch(self, db, collections: list):
+        pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                with db.watch(pipeline) as stream:
+                    # Anything written while we were disconnected may be missed
+                    self.invalidate_all()
+                    delay = 1.0
+                    for change in stream:
+                        self.invalidate(change["ns"]["coll"])
+                        if self._stop.is_set():
+                            return
+            except NotImplementedError:
+                return
+            except Exception as e:
+                if getattr(e, "code", None) == 40573:  # change streams need a replica set
+                    print("Change streams unavailable, read cache relies on its TTL")
+                    return
+                print(f"Read cache change stream failed: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 60)
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "versions": dict(self._versions),
+                "watching": self._watcher is not None and self._watcher.is_alive(),
+            }
+
+
+# Shared by every Database in the process
+read_cache = ReadCache()
@@ -0,0 +1,54 @@
+import os
+
+from models import Roadmap
+
+# Size budget of the roadmap summary shared with the agents, in tokens
+ROADMAP_CONTEXT_TOKENS = int(os.getenv("ROADMAP_CONTEXT_TOKENS", "300"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English text"""
+    return (len(text) + 3) // 4
+
+
+def roadmap_summary(roadmap: Roadmap, max_tokens: int = ROADMAP_CONTEXT_TOKENS) -> str:
+    """Compact, size-bounded summary of a roadmap and the learner's progress
+
+    Lists what is still to learn first, topic by topic, then the finished
+    topics, and stops adding lines once the budget is used up.
+    """
+    subtopics = [subtopic for topic in roadmap.topics for subtopic in topic.subtopics]
+    done = sum(subtopic.completed for subtopic in subtopics)
+    lines = [f"Roadmap: {roadmap.title}"]
+    if roadmap.description:
+        lines.append(f"About: {roadmap.description[:200]}")
+    lines.append(f"Progress: {done}/{len(subtopics)} subtopics completed")
+
+    todo = []
+    for topic in roadmap.topics:
+        remaining = [subtopic.name for subtopic in topic.subtopics if not subtopic.completed]
+        if remaining or (not topic.subtopics and not topic.completed):
+            todo.append(f"- {topic.name}: {', '.join(remaining)}" if remaining else f"- {topic.name}")
+    finished = [topic.name for topic in roadmap.topics if topic.subtopics and all(
+        subtopic.completed for subtopic in topic.subtopics
+    )]
+
+    optional = []
+    if todo:
+        optional += ["Still to learn:"] + todo
+    if finished:
+        optional.append(f"Completed topics: {', '.join(finished)}")
+
+    # Keep room for the note about omitted lines
+    budget = max_tokens * 4 - len("\n".join(lines)) - 32
+    for index, line in enumerate(optional):
+        if len(line) + 1 > budget:
+            if budget > 24:
+                lines.append(line[:budget - 4] + "...")
+            omitted = len(optional) - index - (1 if budget > 24 else 0)
+            if omitted:
+                lines.append(f"(+{omitted} more lines omitted)")
+            break
+        lines.append(line)
+        budget -= len(line) + 1
+    return "\n".join(lines)
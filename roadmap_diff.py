@@ -0,0 +1,98 @@
+import uuid
+from typing import List, Tuple
+
+from models import Roadmap, Topic
+
+# Top-level roadmap fields compared by value
+ROADMAP_FIELDS = ("title", "description")
+TOPIC_FIELDS = ("name", "completed")
+SUBTOPIC_FIELDS = ("name", "completed")
+
+
+def _set_changed(updates: dict, prefix: str, original, edited, fields) -> None:
+    for field in fields:
+        value = getattr(edited, field)
+        if getattr(original, field) != value:
+            updates[f"{prefix}{field}"] = value
+
+
+def _topic_changes(index: int, original: Topic, edited: Topic, sets: dict, pushes: dict) -> bool:
+    """Collect positional changes for one topic; False if it can't be expressed that way"""
+    if len(edited.subtopics) < len(original.subtopics):
+        return False
+    prefix = f"topics.{index}."
+    _set_changed(sets, prefix, original, edited, TOPIC_FIELDS)
+    for position, (before, after) in enumerate(zip(original.subtopics, edited.subtopics)):
+        _set_changed(sets, f"{prefix}subtopics.{position}.", before, after, SUBTOPIC_FIELDS)
+    added = edited.subtopics[len(original.subtopics):]
+    if added:
+        pushes[f"{prefix}subtopics"] = {"$each": [subtopic.model_dump() for subtopic in added]}
+    return True
+
+
+def roadmap_updates(original: Roadmap, edited: Roadmap) -> List[dict]:
+    """Minimal update documents turning the stored `original` into `edited`
+
+    Fields are compared by position: changed ones are set in place (e.g.
+    `topics.3.subtopics.1.completed`), so a reordered list comes out as the
+    fields that differ at each position. Topics or subtopics added at the
+    end are appended with $push. MongoDB rejects operators on overlapping
+    paths in one update, so new subtopics and new topics each come back as a
+    separate update applied after the $set. Removals fall back to setting
+    the whole topics array.
+
+    Returns:
+        Up to three update documents, to be applied in order
+    """
+    sets = {}
+    pushes = {}
+    topic_pushes = {}
+    _set_changed(sets, "", original, edited, ROADMAP_FIELDS)
+
+    if len(edited.topics) < len(original.topics):
+        sets["topics"] = [topic.model_dump() for topic in edited.topics]
+    else:
+        for index, (before, after) in enumerate(zip(original.topics, edited.topics)):
+            if not _topic_changes(index, before, after, sets, pushes):
+                sets = {key: value for key, value in sets.items() if not key.startswith("topics")}
+                sets["topics"] = [topic.model_dump() for topic in edited.topics]
+                pushes = {}
+                break
+        else:
+            added = edited.topics[len(original.topics):]
+            if added:
+                topic_pushes["topics"] = {"$each": [topic.model_dump() for topic in added]}
+
+    updates = []
+    if sets:
+        updates.append({"$set": sets})
+    if pushes:
+        updates.append({"$push": pushes})
+    if topic_pushes:
+        updates.append({"$push": topic_pushes})
+    return updates
+
+
+def new_revision() -> str:
+    return uuid.uuid4().hex
+
+
+def revision_filter(revision: str) -> dict:
+    """Match a roadmap still at revision; ones saved before revisions existed have none"""
+    return {"revision": revision} if revision else {"revision": {"$in": [None, ""]}}
+
+
+def guarded_updates(original: Roadmap, edited: Roadmap, revision: str) -> List[Tuple[dict, dict]]:
+    """(filter, update) pairs for roadmap_updates that only apply to the stored `original`
+
+    The first update moves the roadmap from original.revision to `revision`
+    and the rest require `revision`, so if anyone saved the roadmap since
+    `original` was read, nothing matches instead of positional updates
+    overwriting their changes.
+    """
+    updates = roadmap_updates(original, edited)
+    if not updates:
+        return []
+    updates[0].setdefault("$set", {})["revision"] = revision
+    filters = [revision_filter(original.revision)] + [revision_filter(revision)] * (len(updates) - 1)
+    return list(zip(filters, updates))
@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional
+
+from embedding_cache import normalize_text
+from models import Resource
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+# Bounds staleness from writes made by other processes, which this
+# process's generation counter cannot see
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+
+
+class SearchResultCache:
+    """TTL + LRU cache of search_resources results
+
+    Entries are tagged with the generation they were computed in. Writes
+    that change search results (new resources, re-embedding) call
+    invalidate(), which bumps the generation so older entries are never
+    served again.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_SIZE, ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, limit: int, filters: Optional[dict] = None) -> Hashable:
+        return normalize_text(query), limit, tuple(sorted((filters or {}).items()))
+
+    def get(self, key: Hashable) -> Optional[List[Resource]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, expires_at, resources = entry
+                if generation == self.generation and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    # Copies so callers can't mutate the cached objects
+                    return [resource.model_copy() for resource in resources]
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, resources: List[Resource], generation: int):
+        """Store results computed while `generation` was current
+
+        Results from a search that raced with a write are dropped.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            copies = [resource.model_copy() for resource in resources]
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, copies)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "generation": self.generation,
+            }
+
+
+# Shared by Database and AsyncDatabase so writes through either invalidate both
+search_cache = SearchResultCache()
@@ -5,19 +5,125 @@ from parlant.core.services.tools.plugins import PluginServer, tool
 from parlant.core.services.tools.service_registry import ServiceRegistry
 from parlant.core.tools import ToolContext, ToolResult
 
-from database import Database
+from async_database import AsyncDatabase
+from database import search_limit
 from models import (
     Roadmap, Quiz, Resource, QuizQuestion, QuizChoice,
     Topic, SubTopic
 )
 from datetime import datetime
+from typing import Optional
+from pydantic import ValidationError
 import json
 
 # Initialize database
-db = Database()
+db = AsyncDatabase()
 
 server_instance: PluginServer | None = None
 
+# Errors from malformed agent input that are reported per item by the bulk tools
+INPUT_ERRORS = (KeyError, TypeError, ValueError, ValidationError)
+
+def build_roadmap(title: str, description: str, topics_data: list) -> Roadmap:
+    """Build a Roadmap from the topics structure the tools accept"""
+    # Convert dictionaries to Topic models
+    topic_models = [
+        Topic(
+            name=topic["name"],
+            subtopics=[SubTopic(name=subtopic["name"], completed=False) for subtopic in topic["subtopics"]],
+            completed=False
+        )
+        for topic in topics_data
+    ]
+    
+    return Roadmap(
+        title=title,
+        description=description,
+        topics=topic_models,
+        created_at=datetime.now()
+    )
+
+def build_quiz(title: str, description: str, questions_data: list) -> Quiz:
+    """Build a Quiz from the questions structure the tools accept"""
+    # Convert to QuizQuestion models manually
+    question_models = []
+    for q in questions_data:
+        # Create QuizChoice models for each choice
+        choice_models = [
+            QuizChoice(
+                text=choice["text"],
+                is_correct=choice["is_correct"]
+            )
+            for choice in q["choices"]
+        ]
+        
+        # Create QuizQuestion model
+        question_model = QuizQuestion(
+            question=q["question"],
+            choices=choice_models,
+            explanation=q["explanation"]
+        )
+        question_models.append(question_model)
+    
+    # Create Quiz model
+    return Quiz(
+        title=title,
+        description=description,
+        questions=question_models,
+        created_at=datetime.now()
+    )
+
+def build_resource(name: str, description: str, asset: str, resource_type: str) -> Resource:
+    return Resource(
+        name=name,
+        description=description,
+        asset=asset,
+        resource_type=resource_type,
+        created_at=datetime.now()
+    )
+
+def parse_items(items_json: str, build) -> tuple[list, dict]:
+    """Build a model from every object in a JSON array
+
+    Returns:
+        The valid models with their positions, and an error message per invalid position
+    """
+    items = json.loads(items_json)
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array")
+    valid = []
+    errors = {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, build(item)))
+        except KeyError as e:
+            errors[index] = f"Missing field {e}"
+        except INPUT_ERRORS as e:
+            errors[index] = f"Invalid item: {e}"
+    return valid, errors
+
+async def create_many(items_json: str, build, create) -> ToolResult:
+    """Validate a JSON array, store the valid items in one call and report each item"""
+    try:
+        valid, errors = parse_items(items_json, build)
+    except (ValueError, json.JSONDecodeError) as e:
+        return ToolResult({"message": f"Could not parse items: {e}"})
+
+    try:
+        created = await create([model for _, model in valid])
+    except Exception as e:
+        # Raised before anything was written, e.g. by the embedding model;
+        # write errors are reported per item by create
+        created = [{"error": f"Not created: {e}"}] * len(valid)
+    results = {index: result for (index, _), result in zip(valid, created)}
+    results.update({index: {"error": error} for index, error in errors.items()})
+    ordered = [{"index": index, **results[index]} for index in sorted(results)]
+    succeeded = sum("id" in result for result in ordered)
+    return ToolResult({
+        "message": f"Created {succeeded} of {len(ordered)} items",
+        "results": ordered,
+    })
+
 @tool
 async def create_roadmap(
     context: ToolContext,
@@ -50,23 +156,8 @@ async def create_roadmap(
     # Parse JSON string to list of dicts
     topics_data = json.loads(topics_json)
     
-    # Convert dictionaries to Topic models
-    topic_models = [
-        Topic(
-            name=topic["name"],
-            subtopics=[SubTopic(name=subtopic["name"], completed=False) for subtopic in topic["subtopics"]],
-            completed=False
-        )
-        for topic in topics_data
-    ]
-    
-    roadmap = Roadmap(
-        title=title,
-        description=description,
-        topics=topic_models,
-        created_at=datetime.now()
-    )
-    roadmap_id = db.create_roadmap(roadmap)
+    roadmap = build_roadmap(title, description, topics_data)
+    roadmap_id = await db.create_roadmap(roadmap)
     return ToolResult({"roadmap_id": roadmap_id})
 
 @tool
@@ -121,34 +212,8 @@ async def create_quiz(
     # Parse JSON string to list of dicts
     questions_data = json.loads(questions_json)
     
-    # Convert to QuizQuestion models manually
-    question_models = []
-    for q in questions_data:
-        # Create QuizChoice models for each choice
-        choice_models = [
-            QuizChoice(
-                text=choice["text"],
-                is_correct=choice["is_correct"]
-            )
-            for choice in q["choices"]
-        ]
-        
-        # Create QuizQuestion model
-        question_model = QuizQuestion(
-            question=q["question"],
-            choices=choice_models,
-            explanation=q["explanation"]
-        )
-        question_models.append(question_model)
-    
-    # Create Quiz model
-    quiz = Quiz(
-        title=title,
-        description=description,
-        questions=question_models,
-        created_at=datetime.now()
-    )
-    quiz_id = db.create_quiz(quiz)
+    quiz = build_quiz(title, description, questions_data)
+    quiz_id = await db.create_quiz(quiz)
     return ToolResult({"quiz_id": quiz_id})
 
 
@@ -161,33 +226,131 @@ async def create_resource(
     resource_type: str
 ) -> ToolResult:
     """Create a new resource"""
-    resource = Resource(
-        name=name,
-        description=description,
-        asset=asset,
-        resource_type=resource_type,
-        created_at=datetime.now()
-    )
-    resource_id = db.create_resource(resource)
+    resource = build_resource(name, description, asset, resource_type)
+    resource_id = await db.create_resource(resource)
     return ToolResult({"resource_id": resource_id})
 
+@tool
+async def create_roadmaps(
+    context: ToolContext,
+    roadmaps_json: str  # JSON string containing a list of roadmaps
+) -> ToolResult:
+    """Create several roadmaps at once
+    
+    The roadmaps_json argument should be a JSON string representing a list of roadmaps,
+    each with a title, a description and topics in the same structure as create_roadmap:
+    [
+        {
+            "title": "Python Beginner's Roadmap",
+            "description": "Learn the Python fundamentals",
+            "topics": [
+                {"name": "Python Basics", "subtopics": [{"name": "Variables and Data Types"}]}
+            ]
+        }
+    ]
+    
+    Returns the id or error for each roadmap, by its position in the list.
+    """
+    return await create_many(
+        roadmaps_json,
+        lambda item: build_roadmap(item["title"], item.get("description", ""), item["topics"]),
+        db.create_roadmaps,
+    )
+
+@tool
+async def create_quizzes(
+    context: ToolContext,
+    quizzes_json: str  # JSON string containing a list of quizzes
+) -> ToolResult:
+    """Create several quizzes at once
+    
+    The quizzes_json argument should be a JSON string representing a list of quizzes,
+    each with a title, a description and questions in the same structure as create_quiz:
+    [
+        {
+            "title": "Python Basics Quiz",
+            "description": "Test your Python fundamentals",
+            "questions": [
+                {
+                    "question": "What is a variable in Python?",
+                    "choices": [
+                        {"text": "A container for storing data values", "is_correct": true},
+                        {"text": "A loop statement", "is_correct": false}
+                    ],
+                    "explanation": "A variable is a container that holds data values"
+                }
+            ]
+        }
+    ]
+    
+    Returns the id or error for each quiz, by its position in the list.
+    """
+    return await create_many(
+        quizzes_json,
+        lambda item: build_quiz(item["title"], item.get("description", ""), item["questions"]),
+        db.create_quizzes,
+    )
+
+@tool
+async def create_resources(
+    context: ToolContext,
+    resources_json: str  # JSON string containing a list of resources
+) -> ToolResult:
+    """Create several resources at once
+    
+    The resources_json argument should be a JSON string representing a list of resources:
+    [
+        {
+            "name": "Python Variables Tutorial",
+            "description": "Learn about Python variables and data types",
+            "asset": "https://example.com/python-variables",
+            "resource_type": "video"
+        }
+    ]
+    
+    Prefer this over calling create_resource repeatedly. Returns the id or
+    error for each resource, by its position in the list.
+    """
+    return await create_many(
+        resources_json,
+        lambda item: build_resource(item["name"], item["description"], item.get("asset", ""), item["resource_type"]),
+        db.create_resources,
+    )
+
 @tool
 async def search_resources(
     context: ToolContext,
     query: str,
-    limit: int = 2
+    limit: int = 2,
+    resource_type: str = "",
+    created_after: str = "",
+    min_score: Optional[float] = None
 ) -> ToolResult:
     """Search for resources using vector similarity
     
     Args:
         query: The search query text
-        limit: Maximum number of results to return (default: 5)
+        limit: Maximum number of results to return (default: 2, at most 50)
+        resource_type: Only return this type of resource (video, article, code_example), empty for any
+        created_after: Only return resources added on or after this ISO date (e.g. 2024-06-01), empty for any
+        min_score: Only return results scoring at least this much (0 to 1), omit for the default threshold
     
     Returns:
-        List of resources sorted by relevance to the query
+        List of resources sorted by relevance, each with a score between 0 and 1.
+        Ask for few results and rely on the scores rather than requesting more.
     """
     try:
-        resources = db.search_resources(query, limit)
+        after = datetime.fromisoformat(created_after) if created_after else None
+    except ValueError:
+        return ToolResult({"message": f"Invalid created_after date {created_after!r}, use YYYY-MM-DD"})
+    try:
+        resources = await db.search_resources(
+            query,
+            search_limit(limit),
+            resource_type=resource_type or None,
+            created_after=after,
+            min_score=min_score,
+        )
         return ToolResult(
             {
             "message":f"Found {len(resources)} relevant resources",
@@ -199,11 +362,55 @@ async def search_resources(
             {"message": f"Failed to search resources: {str(e)}"}
         )
 
+LISTINGS = {
+    "roadmaps": lambda limit, token: db.page_roadmaps(limit, token, count=token is None),
+    "quizzes": lambda limit, token: db.page_quizzes(limit, token, count=token is None),
+    "resources": lambda limit, token: db.page_resources(limit, token, count=token is None),
+}
+
+@tool
+async def list_items(
+    context: ToolContext,
+    collection: str,
+    page_token: str = "",
+    limit: int = 10
+) -> ToolResult:
+    """List stored roadmaps, quizzes or resources, newest first, one page at a time
+    
+    Args:
+        collection: One of "roadmaps", "quizzes" or "resources"
+        page_token: The next_page_token of the previous call, empty for the first page
+        limit: Items per page
+    
+    Returns:
+        The items of the page, the token for the next page (empty on the last
+        page) and, on the first page, an estimate of the total number of items.
+        Quizzes are listed with their question count; roadmaps with their topics.
+    """
+    if collection not in LISTINGS:
+        return ToolResult({"message": f"Unknown collection {collection!r}, use one of {', '.join(LISTINGS)}"})
+    try:
+        page = await LISTINGS[collection](limit, page_token or None)
+    except ValueError:
+        return ToolResult({"message": "Invalid page_token, start again without one"})
+    result = {
+        "message": f"Listed {len(page.items)} {collection}",
+        "data": [item.model_dump(mode="json", exclude={"created_at"}) for item in page.items],
+        "next_page_token": page.next_token or "",
+    }
+    if page.total_estimate is not None:
+        result["total_estimate"] = page.total_estimate
+    return ToolResult(result)
+
 TOOLS = [
     create_roadmap,
     create_quiz,
     create_resource,
+    create_roadmaps,
+    create_quizzes,
+    create_resources,
     search_resources,
+    list_items,
 ]
 
 async def initialize_module(container: Container) -> None:
@@ -238,5 +445,7 @@ async def shutdown_module() -> None:
         await server_instance.shutdown()
         server_instance = None
 
+    await db.close()
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,251 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from async_database import AsyncDatabase
+from embedding_scheduler import EmbeddingScheduler
+from read_cache import ReadCache
+from search_cache import SearchResultCache
+from models import Resource
+
+EMBED_SECONDS = 0.2
+MONGO_SECONDS = 0.1
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return list(self.documents)
+
+
+class FakeCollection:
+    """Async collection whose round trips just sleep without blocking the loop"""
+
+    def __init__(self, name="resources"):
+        self.name = name
+        self.pipelines = []
+        self.counts = 0
+
+    async def insert_one(self, data):
+        await asyncio.sleep(MONGO_SECONDS)
+        return SimpleNamespace(inserted_id=ObjectId())
+
+    async def insert_many(self, documents, ordered=True):
+        await asyncio.sleep(MONGO_SECONDS)
+        for document in documents:
+            document["_id"] = ObjectId()
+        return SimpleNamespace(inserted_ids=[document["_id"] for document in documents])
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        await asyncio.sleep(MONGO_SECONDS)
+        return FakeCursor([{
+            "_id": ObjectId(),
+            "name": "Python Basics",
+            "description": "Intro to Python",
+            "resource_type": "article",
+            "score": 0.9,
+        }])
+
+
+    async def estimated_document_count(self):
+        return 100
+
+    async def count_documents(self, query):
+        self.counts += 1
+        return 5
+
+
+class SlowEncoder:
+    """Stands in for model.encode: blocks its thread, not the event loop"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, texts):
+        self.batch_sizes.append(len(texts))
+        time.sleep(EMBED_SECONDS)
+        return [[0.0] * 1024 for _ in texts]
+
+
+class FakeAliases:
+    async def find_one(self, query):
+        return None
+
+
+class FakeDb(SimpleNamespace):
+    def __getitem__(self, name):
+        return FakeAliases()
+
+
+def make_database(encoder, **scheduler_options):
+    client = SimpleNamespace(ai_tutor_db=FakeDb(**{
+        name: FakeCollection(name) for name in ("roadmaps", "quizzes", "resources")
+    }))
+    scheduler = EmbeddingScheduler(encode_batch=encoder, **scheduler_options)
+    db = AsyncDatabase(client=client, vector_backend="atlas", scheduler=scheduler)
+    db.search_cache = SearchResultCache()
+    db.read_cache = ReadCache()
+    return db
+
+
+def test_parallel_searches_overlap():
+    db = make_database(SlowEncoder())
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(db.search_resources("python") for _ in range(4)))
+        return time.perf_counter() - start, results
+
+    elapsed, results = asyncio.run(run())
+    serial = 4 * (EMBED_SECONDS + MONGO_SECONDS)
+    assert all(len(resources) == 1 for resources in results)
+    assert elapsed < serial / 2
+
+
+def test_event_loop_stays_responsive_while_embedding():
+    db = make_database(SlowEncoder(), workers=1)
+
+    async def run():
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.create_task(ticker())
+        await db.create_resource(Resource(name="Loops", description="for and while", resource_type="video"))
+        done.set()
+        await task
+        return max(gaps)
+
+    assert asyncio.run(run()) < EMBED_SECONDS / 2
+
+
+def test_concurrent_embeddings_share_a_batch():
+    encoder = SlowEncoder()
+    db = make_database(encoder, window_ms=50, max_batch_size=3, workers=1)
+
+    async def run():
+        return await asyncio.gather(*(db.embed(f"query {i}") for i in range(4)))
+
+    vectors = asyncio.run(run())
+    stats = db.scheduler.stats()
+    assert len(vectors) == 4
+    assert encoder.batch_sizes == [3, 1]
+    assert stats["batches"] == 2
+    assert stats["mean_batch_fill"] == 4 / 6
+    assert stats["max_queue_delay_ms"] >= EMBED_SECONDS * 1000
+
+
+def test_repeated_search_is_served_from_cache_until_a_write():
+    encoder = SlowEncoder()
+    db = make_database(encoder)
+
+    async def run():
+        first = await db.search_resources("python")
+        again = await db.search_resources("  python ")
+        await db.create_resource(Resource(name="Loops", description="for and while", resource_type="video"))
+        after_write = await db.search_resources("python")
+        return first, again, after_write
+
+    first, again, after_write = asyncio.run(run())
+    assert again[0].mongo_id == first[0].mongo_id
+    assert after_write[0].mongo_id != first[0].mongo_id
+    # search, create_resource, search again; the repeated query never embeds
+    assert len(encoder.batch_sizes) == 3
+    assert db.search_cache.stats()["hits"] == 1
+
+
+def test_bulk_resources_are_embedded_together():
+    encoder = SlowEncoder()
+    db = make_database(encoder, window_ms=20)
+    resources = [
+        Resource(name=f"Resource {i}", description="Python basics", resource_type="article")
+        for i in range(5)
+    ]
+
+    results = asyncio.run(db.create_resources(resources))
+
+    # Submitted as one group, so no other worker can take part of it
+    assert encoder.batch_sizes == [5]
+    assert [set(result) for result in results] == [{"id"}] * 5
+
+
+def test_large_groups_are_split_at_the_batch_size():
+    encoder = SlowEncoder()
+    scheduler = EmbeddingScheduler(encode_batch=encoder, max_batch_size=2)
+
+    vectors = [future.result(timeout=5) for future in scheduler.submit_many([f"text {i}" for i in range(5)])]
+
+    assert len(vectors) == 5
+    assert sorted(encoder.batch_sizes) == [1, 2, 2]
+    scheduler.shutdown()
+
+
+def test_encoder_errors_reach_every_caller():
+    def failing(texts):
+        raise RuntimeError("model unavailable")
+
+    scheduler = EmbeddingScheduler(encode_batch=failing, window_ms=20)
+    futures = [scheduler.submit(f"query {i}") for i in range(3)]
+    for future in futures:
+        try:
+            future.result(timeout=1)
+        except RuntimeError as e:
+            assert str(e) == "model unavailable"
+        else:
+            raise AssertionError("expected the encoder error")
+    scheduler.shutdown()
+
+
+def test_filtered_search_returns_scores_and_widens_candidates():
+    db = make_database(SlowEncoder())
+
+    resources = asyncio.run(db.search_resources("python", 1, resource_type="article"))
+    stage = db.db.resources.pipelines[-1][0]["$vectorSearch"]
+
+    assert stage["filter"] == {"resource_type": "article"}
+    # 5 of 100 resources match, so 20x the unfiltered candidates
+    assert stage["numCandidates"] == 200
+    assert resources[0].score == 0.9
+    assert asyncio.run(db.search_resources("python", 1, resource_type="article", min_score=0.95)) == []
+    # The filter's selectivity is counted once and then served from the read cache
+    assert db.db.resources.counts == 1
+
+
+class DroppingCollection(FakeCollection):
+    """Writes the first document of a batch, then loses the connection"""
+
+    def __init__(self, name="resources"):
+        super().__init__(name)
+        self.stored = []
+
+    async def insert_many(self, documents, ordered=True):
+        for document in documents:
+            document["_id"] = ObjectId()
+        self.stored.append(documents[0]["_id"])
+        raise AutoReconnect("connection closed")
+
+    def find(self, query, projection=None):
+        return FakeCursor([{"_id": item_id} for item_id in self.stored if item_id in query["_id"]["$in"]])
+
+
+def test_interrupted_bulk_insert_reports_what_was_written():
+    db = make_database(SlowEncoder())
+    db.db.roadmaps = DroppingCollection("roadmaps")
+
+    results = asyncio.run(db._insert_many(db.db.roadmaps, [{"title": "A"}, {"title": "B"}]))
+
+    assert results[0] == {"id": str(db.db.roadmaps.stored[0])}
+    assert results[1]["error"].startswith("Write failed")
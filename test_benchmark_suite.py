@@ -0,0 +1,18 @@
+import json
+import sys
+
+import pytest
+
+
+def test_slower_run_than_stored_baseline_fails(suite, tmp_path, monkeypatch):
+    results = tmp_path / "benchmark-results.json"
+    results.write_text(json.dumps({"runs": [{"size": 10, "seconds": {"get_all_roadmaps": 1e-9}}]}))
+    monkeypatch.setattr(suite, "run_size", lambda size, repeat: {"size": size, "seconds": {"get_all_roadmaps": 0.01}})
+    monkeypatch.setattr(sys, "argv", [
+        "suite.py", "--sizes", "10", "--output", str(results), "--baseline", str(results),
+    ])
+
+    with pytest.raises(SystemExit) as exit_info:
+        suite.main()
+    assert exit_info.value.code == 1
+    assert json.loads(results.read_text())["runs"][0]["seconds"]["get_all_roadmaps"] == 0.01
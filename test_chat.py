@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from parlant.client.core.api_error import ApiError
+
+from components.chat import stream_agent_events
+
+
+def event(offset, kind, **data):
+    return SimpleNamespace(offset=offset, kind=kind, data=data)
+
+
+class FakeSessions:
+    """Replays batches of events, one per list_events call"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.offsets = []
+
+    def list_events(self, session_id, source, kinds, min_offset, wait_for_data):
+        self.offsets.append(min_offset)
+        batch = self.batches.pop(0)
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+
+def test_events_are_yielded_until_the_agent_is_ready():
+    sessions = FakeSessions([
+        [event(3, "status", status="typing")],
+        ApiError(status_code=504),
+        [event(4, "message", message="Hello"), event(5, "message", message="Anything else?")],
+        [event(6, "status", status="ready")],
+    ])
+    client = SimpleNamespace(sessions=sessions)
+
+    events = list(stream_agent_events(client, "session", 3))
+
+    assert [e.data.get("message") for e in events if e.kind == "message"] == ["Hello", "Anything else?"]
+    assert sessions.offsets == [3, 4, 4, 6]
+
+
+def test_stops_at_the_timeout_without_events():
+    client = SimpleNamespace(sessions=FakeSessions([]))
+    assert list(stream_agent_events(client, "session", 0, timeout=0)) == []
+
+
+def test_cancelled_replies_end_the_stream():
+    sessions = FakeSessions([
+        [event(3, "status", status="processing"), event(4, "status", status="cancelled")],
+        [event(5, "message", message="Too late")],
+    ])
+    client = SimpleNamespace(sessions=sessions)
+
+    events = list(stream_agent_events(client, "session", 3))
+
+    assert [e.data["status"] for e in events] == ["processing", "cancelled"]
+    assert sessions.offsets == [3]
@@ -0,0 +1,31 @@
+import gc
+import threading
+
+from decoding import decode_trusted, gc_paused
+from models import SubTopic
+
+
+def test_overlapping_pauses_restore_the_collector_once():
+    assert gc.isenabled()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def other_session():
+        with gc_paused():
+            inside.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=other_session)
+    with gc_paused():
+        thread.start()
+        inside.wait(5)
+    # The other thread is still decoding
+    assert not gc.isenabled()
+    release.set()
+    thread.join()
+    assert gc.isenabled()
+
+
+def test_trusted_documents_decode_into_models():
+    subtopics = decode_trusted(SubTopic, [{"name": "Loops", "completed": True}])
+    assert subtopics == [SubTopic(name="Loops", completed=True)]
@@ -0,0 +1,46 @@
+from embedding_cache import EmbeddingCache, cache_key
+
+
+def test_memory_hits_and_misses():
+    cache = EmbeddingCache(max_entries=2)
+    key = cache_key("model", "python loops")
+    assert cache.get(key) is None
+
+    cache.put(key, [0.5, 0.25])
+    assert cache.get(cache_key("model", "  python   loops ")) == [0.5, 0.25]
+    assert cache.get(cache_key("other-model", "python loops")) is None
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many({"a": [1.0], "b": [2.0]})
+    cache.get("a")
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0] and cache.get("c") == [3.0]
+
+
+def test_callers_cannot_change_cached_vectors():
+    cache = EmbeddingCache()
+    vector = [1.0, 2.0]
+    cache.put("a", vector)
+    vector[0] = 9.0
+    cache.get("a")[1] = 9.0
+
+    assert cache.get("a") == [1.0, 2.0]
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.sqlite")
+    EmbeddingCache(path).put("a", [0.5, -0.25])
+
+    cache = EmbeddingCache(path, max_entries=1)
+    assert cache.get("a") == [0.5, -0.25]
+    assert cache.stats()["disk_hits"] == 1
+    cache.get("a")
+    assert cache.stats()["memory_hits"] == 1
+
+    cache.clear()
+    assert EmbeddingCache(path).get("a") is None
@@ -0,0 +1,55 @@
+import threading
+
+from models import Resource
+from lexical_index import BM25Index, is_strong_match, reciprocal_rank_fusion
+
+
+def resource(item_id, name, description=""):
+    return Resource(mongo_id=item_id, name=name, description=description, resource_type="article")
+
+
+def test_exact_terms_rank_first():
+    index = BM25Index()
+    index.add_many([
+        ("1", "Python basics variables and loops"),
+        ("2", "Asyncio tasks and the event loop"),
+        ("3", "Pandas groupby and aggregation"),
+    ])
+    assert [item_id for item_id, _ in index.search("pandas groupby", 2)] == ["3"]
+    assert index.search("asyncio", 3)[0][0] == "2"
+
+
+def test_only_allowed_ids_are_ranked():
+    index = BM25Index()
+    index.add_many([(str(i), f"python loops {i}") for i in range(10)])
+    assert [item_id for item_id, _ in index.search("python loops", 3, allowed={"7"})] == ["7"]
+
+
+def test_search_while_adding_from_another_thread():
+    index = BM25Index()
+    index.add("0", "python loops")
+
+    def add():
+        for i in range(1, 20000):
+            index.add(str(i), f"python loops variant {i}")
+
+    writer = threading.Thread(target=add)
+    writer.start()
+    while writer.is_alive():
+        assert index.search("python loops", 5)
+    writer.join()
+    assert len(index) == 20000
+
+
+def test_strong_match_needs_every_term_in_enough_hits():
+    hits = [resource("1", "Pandas groupby guide"), resource("2", "Data analysis", "pandas groupby recipes")]
+    assert is_strong_match("pandas groupby", hits, 2)
+    assert not is_strong_match("pandas groupby", hits, 3)
+    assert not is_strong_match("pandas merge", hits, 1)
+    assert not is_strong_match("pandas groupby", hits[::-1], 1)
+
+
+def test_fusion_rewards_items_ranked_by_both():
+    a, b, c = resource("a", "A"), resource("b", "B"), resource("c", "C")
+    fused = reciprocal_rank_fusion([[a, b], [c, b]], limit=3)
+    assert [item.mongo_id for item in fused] == ["b", "a", "c"]
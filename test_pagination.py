@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from models import Resource
+from pagination import build_page, decode_token, page_pipeline
+
+
+def make_documents(count):
+    created_at = datetime(2024, 1, 1)
+    return [
+        {"_id": ObjectId(), "name": f"Resource {i}", "description": "", "resource_type": "video", "created_at": created_at}
+        for i in range(count)
+    ]
+
+
+def test_token_points_after_the_last_item_of_the_page():
+    documents = make_documents(3)
+    page = build_page(Resource, [dict(item) for item in documents], limit=2)
+
+    assert [item.name for item in page.items] == ["Resource 0", "Resource 1"]
+    assert decode_token(page.next_token) == (documents[1]["created_at"], documents[1]["_id"])
+
+    match = page_pipeline({"name": 1}, 2, page.next_token)[0]["$match"]
+    assert match["$or"][1] == {"created_at": documents[1]["created_at"], "_id": {"$lt": documents[1]["_id"]}}
+
+
+def test_last_page_has_no_token():
+    page = build_page(Resource, make_documents(2), limit=2)
+    assert page.next_token is None
+
+
+def test_invalid_tokens_are_rejected():
+    with pytest.raises(ValueError):
+        page_pipeline({}, 10, "not-a-token")
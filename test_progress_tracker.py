@@ -0,0 +1,113 @@
+import mongomock
+import pytest
+
+from database import Database
+from models import Roadmap, SubTopic, Topic
+from progress_tracker import ProgressTracker
+from read_cache import ReadCache
+
+pytestmark = pytest.mark.usefixtures("mongomock_bulk_updates")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingDatabase(Database):
+    """mongomock-backed Database counting roadmap reads and writes"""
+
+    def __init__(self):
+        super().__init__(client=mongomock.MongoClient(), read_cache=ReadCache())
+        self.reads = 0
+        self.writes = 0
+
+    def get_roadmap(self, roadmap_id):
+        self.reads += 1
+        return super().get_roadmap(roadmap_id)
+
+    def update_roadmap_changes(self, roadmap_id, original, edited):
+        self.writes += 1
+        return super().update_roadmap_changes(roadmap_id, original, edited)
+
+
+def make_database():
+    db = CountingDatabase()
+    roadmap_id = db.create_roadmap(Roadmap(
+        title="Python",
+        topics=[
+            Topic(name="Basics", subtopics=[SubTopic(name="Variables"), SubTopic(name="Variables")]),
+            Topic(name="Functions", subtopics=[SubTopic(name="Arguments")]),
+        ],
+    ))
+    roadmap = db.get_roadmap(roadmap_id)
+    db.reads = 0
+    return db, roadmap_id, roadmap
+
+
+def test_changes_are_saved_once_they_settle():
+    clock = FakeClock()
+    db, roadmap_id, shown = make_database()
+    tracker = ProgressTracker(roadmap_id, debounce_seconds=3, clock=clock)
+
+    tracker.record(shown, 0, 1, True)
+    clock.now = 2
+    tracker.record(shown, 1, 0, True)
+    clock.now = 4
+    assert tracker.dirty and not tracker.due()
+    assert tracker.completed(shown, 0, 1) and not tracker.completed(shown, 0, 0)
+
+    clock.now = 5
+    assert tracker.due()
+    assert tracker.flush(db)
+    assert not tracker.dirty
+    assert (db.reads, db.writes) == (0, 1)
+
+    stored = db.get_roadmap(roadmap_id)
+    assert [subtopic.completed for subtopic in stored.topics[0].subtopics] == [False, True]
+    assert stored.topics[1].completed and not stored.topics[0].completed
+
+    # The next save builds on the saved revision, still without reading
+    tracker.record(shown, 0, 0, True)
+    db.reads = 0
+    assert tracker.flush(db)
+    assert db.reads == 0
+    assert db.get_roadmap(roadmap_id).topics[0].completed
+
+
+def test_toggling_back_writes_nothing():
+    db, roadmap_id, shown = make_database()
+    tracker = ProgressTracker(roadmap_id, clock=FakeClock())
+
+    tracker.record(shown, 0, 0, True)
+    tracker.record(shown, 0, 0, False)
+    assert tracker.flush(db)
+    assert db.get_roadmap(roadmap_id).revision == shown.revision
+
+
+def test_changes_made_elsewhere_are_kept():
+    db, roadmap_id, shown = make_database()
+    tracker = ProgressTracker(roadmap_id, clock=FakeClock())
+
+    other = shown.model_copy(deep=True)
+    other.topics.append(Topic(name="Classes"))
+    assert db.update_roadmap_changes(roadmap_id, shown, other)
+
+    tracker.record(shown, 0, 0, True)
+    assert tracker.flush(db)
+    assert db.reads == 1
+    stored = db.get_roadmap(roadmap_id)
+    assert stored.topics[0].subtopics[0].completed and stored.topics[2].name == "Classes"
+
+
+def test_changes_to_a_deleted_roadmap_are_discarded():
+    db, roadmap_id, shown = make_database()
+    tracker = ProgressTracker(roadmap_id, clock=FakeClock())
+    db.db.roadmaps.delete_many({})
+
+    tracker.record(shown, 0, 0, True)
+    assert tracker.flush(db)
+    assert tracker.discarded and not tracker.dirty
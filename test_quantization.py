@@ -0,0 +1,23 @@
+import numpy as np
+
+from database import rescores
+from quantization import int8_vector, rescore
+
+
+def test_rescore_ranks_by_int8_vectors_without_touching_the_query():
+    query = np.array([3.0, 4.0], dtype=np.float32)
+    documents = [
+        {"name": "far", "embedding_int8": int8_vector([-1.0, 0.2])},
+        {"name": "close", "embedding_int8": int8_vector([0.6, 0.8])},
+    ]
+
+    ranked = rescore(query, documents, 1)
+
+    assert [document["name"] for document in ranked] == ["close"]
+    assert ranked[0]["score"] > 0.99
+    assert query.tolist() == [3.0, 4.0]
+
+
+def test_only_binary_candidates_are_rescored():
+    assert rescores("binary")
+    assert not rescores("int8") and not rescores("float")
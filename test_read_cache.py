@@ -0,0 +1,109 @@
+from models import QuizSummary, SubTopic, Topic
+from pagination import Page
+from read_cache import ReadCache
+
+
+def test_values_are_served_until_the_collection_changes():
+    cache = ReadCache()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return ("roadmap",)
+
+    assert cache.get_or_load("roadmaps", "all", load) == ("roadmap",)
+    assert cache.get_or_load("roadmaps", "all", load) == ("roadmap",)
+    cache.invalidate("quizzes")
+    cache.get_or_load("roadmaps", "all", load)
+    assert len(loads) == 1
+
+    cache.invalidate("roadmaps")
+    cache.get_or_load("roadmaps", "all", load)
+    assert len(loads) == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_entries_expire_after_the_ttl():
+    cache = ReadCache(ttl_seconds=0)
+    loads = []
+    for _ in range(2):
+        cache.get_or_load("quizzes", "all", lambda: loads.append(1))
+    assert len(loads) == 2
+
+
+def test_value_loaded_during_a_write_is_not_stored():
+    cache = ReadCache()
+
+    def stale_load():
+        # A write lands between the read and storing its result
+        cache.invalidate("resources")
+        return "stale"
+
+    assert cache.get_or_load("resources", ("id", "1"), stale_load) == "stale"
+    assert cache.get_or_load("resources", ("id", "1"), lambda: "fresh") == "fresh"
+
+
+class FakeStream(list):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeDb:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def watch(self, pipeline):
+        self.cache.stop()
+        return FakeStream([{"ns": {"db": "ai_tutor_db", "coll": "quizzes"}}])
+
+
+def test_change_stream_events_invalidate_the_collection():
+    cache = ReadCache()
+    cache.get_or_load("quizzes", "all", lambda: "old")
+    cache.watch(FakeDb(cache))
+    cache._watcher.join(timeout=5)
+    assert cache.get_or_load("quizzes", "all", lambda: "new") == "new"
+    # Once when the stream opened, once for the event
+    assert cache.stats()["versions"]["quizzes"] == 2
+
+
+def test_callers_get_their_own_copies():
+    cache = ReadCache()
+    load = lambda: (Topic(name="Basics", subtopics=[SubTopic(name="Variables")]),)
+
+    cache.get_or_load("roadmaps", "all", load)[0].subtopics[0].completed = True
+    cache.get_or_load("roadmaps", "all", load)[0].name = "Edited"
+
+    topic = cache.get_or_load("roadmaps", "all", load)[0]
+    assert topic.name == "Basics" and not topic.subtopics[0].completed
+
+
+def test_cached_pages_keep_their_item_type():
+    cache = ReadCache()
+    load = lambda: Page[QuizSummary](items=[QuizSummary(title="Loops")], next_token="abc")
+
+    cache.get_or_load("quizzes", ("page", 20, None), load)
+    page = cache.get_or_load("quizzes", ("page", 20, None), load)
+    assert isinstance(page.items[0], QuizSummary) and page.next_token == "abc"
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ReadCache(max_entries=2)
+    cache.get_or_load("quizzes", "a", lambda: "a")
+    cache.get_or_load("quizzes", "b", lambda: "b")
+    cache.get_or_load("quizzes", "a", lambda: "reloaded")
+    cache.get_or_load("quizzes", "c", lambda: "c")
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get_or_load("quizzes", "a", lambda: "reloaded") == "a"
+    assert cache.get_or_load("quizzes", "b", lambda: "reloaded") == "reloaded"
+
+
+def test_expired_entries_are_dropped_on_lookup():
+    cache = ReadCache(ttl_seconds=0)
+    cache.get_or_load("quizzes", "all", lambda: "old")
+    cache._lookup("quizzes", "all")
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,27 @@
+from models import Roadmap, SubTopic, Topic
+from roadmap_context import estimate_tokens, roadmap_summary
+
+
+def make_roadmap(topics=10, subtopics=8, completed_topics=3):
+    return Roadmap(
+        title="Python",
+        topics=[
+            Topic(name=f"Topic {t}", subtopics=[
+                SubTopic(name=f"Subtopic {t}.{s}", completed=t < completed_topics) for s in range(subtopics)
+            ])
+            for t in range(topics)
+        ],
+    )
+
+
+def test_incomplete_subtopics_come_first():
+    summary = roadmap_summary(make_roadmap())
+    assert "Progress: 24/80 subtopics completed" in summary
+    assert summary.index("Topic 3: Subtopic 3.0") < summary.index("Completed topics: Topic 0, Topic 1, Topic 2")
+    assert "Subtopic 0.0" not in summary
+
+
+def test_summary_stays_within_the_budget():
+    summary = roadmap_summary(make_roadmap(topics=50, completed_topics=0), max_tokens=100)
+    assert estimate_tokens(summary) <= 100
+    assert summary.endswith("more lines omitted)")
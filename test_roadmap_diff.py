@@ -0,0 +1,94 @@
+import mongomock
+import pytest
+
+from database import Database
+from models import Roadmap, SubTopic, Topic
+from read_cache import ReadCache
+from roadmap_diff import roadmap_updates
+
+pytestmark = pytest.mark.usefixtures("mongomock_bulk_updates")
+
+
+def make_roadmap():
+    return Roadmap(
+        title="Python",
+        topics=[
+            Topic(name="Basics", subtopics=[SubTopic(name="Variables"), SubTopic(name="Loops")]),
+            Topic(name="Functions", subtopics=[SubTopic(name="Arguments")]),
+        ],
+    )
+
+
+def make_database(roadmap):
+    db = Database(client=mongomock.MongoClient(), read_cache=ReadCache())
+    return db, db.create_roadmap(roadmap)
+
+
+def stored(db, roadmap_id):
+    return db.get_roadmap(roadmap_id).model_dump(exclude={"revision"})
+
+
+def test_changed_fields_are_set_by_position():
+    original = make_roadmap()
+    edited = original.model_copy(deep=True)
+    edited.topics[0].subtopics[1].completed = True
+
+    assert roadmap_updates(original, edited) == [{"$set": {"topics.0.subtopics.1.completed": True}}]
+
+
+def test_additions_are_pushed_after_the_set():
+    original = make_roadmap()
+    edited = original.model_copy(deep=True)
+    edited.title = "Python 3"
+    edited.topics[1].subtopics.append(SubTopic(name="Defaults"))
+    edited.topics.append(Topic(name="Classes"))
+
+    updates = roadmap_updates(original, edited)
+    assert [list(update) for update in updates] == [["$set"], ["$push"], ["$push"]]
+    assert list(updates[1]["$push"]) == ["topics.1.subtopics"]
+    assert list(updates[2]["$push"]) == ["topics"]
+
+
+def test_unchanged_roadmap_needs_no_update():
+    original = make_roadmap()
+    assert roadmap_updates(original, original.model_copy(deep=True)) == []
+
+
+def test_reordered_and_shortened_roadmaps_are_saved_exactly():
+    original = make_roadmap()
+    db, roadmap_id = make_database(original)
+    original = db.get_roadmap(roadmap_id)
+
+    reordered = original.model_copy(deep=True)
+    reordered.topics.reverse()
+    assert db.update_roadmap_changes(roadmap_id, original, reordered)
+    assert stored(db, roadmap_id) == reordered.model_dump(exclude={"revision"})
+
+    shortened = reordered.model_copy(deep=True)
+    shortened.topics[1].subtopics.pop()
+    assert db.update_roadmap_changes(roadmap_id, reordered, shortened)
+    assert stored(db, roadmap_id) == shortened.model_dump(exclude={"revision"})
+
+
+def test_edits_of_an_outdated_copy_are_rejected():
+    db, roadmap_id = make_database(make_roadmap())
+    first = db.get_roadmap(roadmap_id)
+    second = db.get_roadmap(roadmap_id)
+
+    edited = first.model_copy(deep=True)
+    edited.topics[0].subtopics[0].completed = True
+    assert db.update_roadmap_changes(roadmap_id, first, edited)
+
+    # Positionally this would also write subtopic 0 back as not completed
+    stale = second.model_copy(deep=True)
+    stale.topics[0].subtopics[0].name = "Names"
+    stale.topics[0].subtopics[0].completed = False
+    assert not db.update_roadmap_changes(roadmap_id, second, stale)
+    assert db.get_roadmap(roadmap_id).topics[0].subtopics[0].completed
+
+    # Retrying against a fresh read goes through
+    current = db.get_roadmap(roadmap_id)
+    renamed = current.model_copy(deep=True)
+    renamed.topics[0].subtopics[0].name = "Names"
+    assert db.update_roadmap_changes(roadmap_id, current, renamed)
+    assert db.get_roadmap(roadmap_id).topics[0].subtopics[0].name == "Names"
@@ -0,0 +1,87 @@
+import threading
+
+import mongomock
+import numpy as np
+
+import database
+from database import EMBEDDING_DIMENSIONS, Database
+from models import Resource
+from read_cache import ReadCache
+from vector_index import LocalVectorIndex
+
+
+def unit(axis, dimensions=EMBEDDING_DIMENSIONS):
+    vector = np.zeros(dimensions, dtype=np.float32)
+    vector[axis] = 1.0
+    return vector.tolist()
+
+
+def test_removed_vectors_are_no_longer_found():
+    for mode in ("exact", "ivf"):
+        index = LocalVectorIndex(8, mode=mode, n_probe=8)
+        index.add_many((str(axis), unit(axis, 8)) for axis in range(8))
+
+        assert index.remove_many(["3", "missing"]) == 1
+        assert "3" not in index and len(index) == 7
+        assert [item_id for item_id, _ in index.search(unit(3, 8), 8)].count("3") == 0
+        assert index.search(unit(5, 8), 1)[0][0] == "5"
+        assert index.search(unit(6, 8), 1, allowed=["3", "6"])[0][0] == "6"
+
+
+def test_ivf_search_while_adding_and_training_from_another_thread():
+    index = LocalVectorIndex(8, mode="ivf", n_lists=4, n_probe=4)
+    index.add_many((str(axis), unit(axis, 8)) for axis in range(8))
+    rng = np.random.default_rng(0)
+
+    def add():
+        for i in range(300):
+            index.add(f"v{i}", rng.normal(size=8).tolist())
+            index.add(str(i % 8), unit(i % 8, 8))
+
+    writer = threading.Thread(target=add)
+    writer.start()
+    while writer.is_alive():
+        assert index.search(unit(2, 8), 3)
+    writer.join()
+    assert len(index) == 308 and sum(map(len, index._lists)) == 308
+    assert index.search(unit(2, 8), 1)[0] == ("2", 1.0)
+
+def test_updates_and_deletes_reach_the_local_index(monkeypatch):
+    axes = {"Loops": 1, "Classes": 2, "Generators": 3}
+    monkeypatch.setattr(database, "get_embedding", lambda text: unit(axes[text.split(":")[0]]))
+    monkeypatch.setattr(database, "resource_embedding_text", lambda name, description: f"{name}: {description}")
+    db = Database("local", client=mongomock.MongoClient(), read_cache=ReadCache())
+    loops = db.create_resource(Resource(name="Loops", description="for and while", resource_type="article"))
+    classes = db.create_resource(Resource(name="Classes", description="objects", resource_type="article"))
+    index, lexical = db._get_local_index(), db._get_lexical_index()
+
+    db.update_resource(loops, Resource(name="Generators", description="yield", resource_type="article"))
+    assert index.search(unit(3), 1)[0] == (loops, 1.0)
+    assert [item_id for item_id, _ in lexical.search("generators loops", 2)] == [loops]
+    assert lexical.search("loops", 2) == []
+
+    db.delete_resource(loops)
+    assert loops not in index and loops not in lexical.ids
+
+    # Deleted by another process: dropped on the next sync
+    other = Database("local", client=db.client, read_cache=ReadCache())
+    other.delete_resource(classes)
+    db._sync_local_index()
+    db._sync_lexical_index()
+    assert len(index) == 0 and len(lexical) == 0
+
+
+def test_filtered_keyword_search_scores_and_thresholds_hits(monkeypatch):
+    monkeypatch.setattr(database, "get_embedding", lambda text: unit(0))
+    db = Database("local", client=mongomock.MongoClient(), read_cache=ReadCache())
+    for i in range(5):
+        db.create_resource(Resource(name=f"Loops {i}", description="python loops", resource_type="article"))
+    talk = db.create_resource(Resource(name="Loop talk", description="loops", resource_type="video"))
+    classes = db.create_resource(Resource(name="Classes", description="python loops classes", resource_type="video"))
+
+    # The articles rank higher, but must not crowd the videos out of the top 2
+    hits = db.local_lexical_search("python loops", 2, {"resource_type": "video"})
+    assert [hit.mongo_id for hit in hits] == [classes, talk]
+    assert hits[0].score == 1.0 and 0 < hits[1].score < 1
+    hits = db.local_lexical_search("python loops", 2, {"resource_type": "video"}, min_score=1.0)
+    assert [hit.mongo_id for hit in hits] == [classes]
@@ -0,0 +1,297 @@
+import json
+import os
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class LocalVectorIndex:
+    """In-process cosine similarity index over resource embeddings
+
+    Vectors are kept L2-normalised in one contiguous float32 matrix so an
+    exact search is a single matrix-vector product. For larger corpora an
+    IVF mode clusters the vectors with k-means and only scores the lists
+    closest to the query. Searches work on a snapshot of the index, so they
+    can run while other threads add or remove vectors: the matrix and the
+    IVF lists are replaced rather than changed in place (apart from rows of
+    replaced vectors).
+
+    Args:
+        dimensions: Embedding size
+        mode: "exact", "ivf", or "auto" (IVF once the index reaches ivf_min_size)
+        n_lists: Number of IVF clusters, defaults to sqrt(size)
+        n_probe: Number of IVF clusters scanned per query
+        ivf_min_size: Size at which "auto" switches to IVF
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 1024,
+        mode: str = "auto",
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        ivf_min_size: int = 10000,
+    ):
+        if mode not in ("exact", "ivf", "auto"):
+            raise ValueError(f"Unknown vector index mode: {mode}")
+        self.dimensions = dimensions
+        self.mode = mode
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.ivf_min_size = ivf_min_size
+
+        self._vectors = np.empty((0, dimensions), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._positions = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._trained_size = 0
+        # Bumped by every change, so train() can tell if it raced one
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self._size]
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        if needed <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        capacity = max(needed, 2 * len(self._vectors), 64)
+        grown = np.empty((capacity, self.dimensions), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+
+    def add_many(self, items: Iterable[Tuple[str, List[float]]]):
+        """Insert or replace vectors by id"""
+        items = list(items)
+        if not items:
+            return
+        vectors = _normalize(np.asarray([vector for _, vector in items], dtype=np.float32))
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions} dimensions, got {vectors.shape[1]}")
+
+        with self._lock:
+            self._reserve(len(items))
+            written, replaced = [], set()
+            for (item_id, _), vector in zip(items, vectors):
+                position = self._positions.get(item_id)
+                if position is not None:
+                    self._vectors[position] = vector
+                    replaced.add(position)
+                else:
+                    position = self._size
+                    self._vectors[position] = vector
+                    self._ids.append(item_id)
+                    self._positions[item_id] = position
+                    self._size += 1
+                written.append(position)
+            if self._centroids is not None:
+                self._lists = self._assigned(list(dict.fromkeys(written)), replaced)
+            self._version += 1
+
+        if self._use_ivf() and (self._centroids is None or self._size >= 2 * self._trained_size):
+            self.train()
+
+    def add(self, item_id: str, vector: List[float]):
+        self.add_many([(item_id, vector)])
+
+    def remove_many(self, item_ids: Iterable[str]) -> int:
+        """Drop vectors by id, e.g. of deleted resources
+
+        The remaining vectors are compacted into a new matrix rather than
+        moved in place, so searches running on the old one stay consistent.
+
+        Returns:
+            Number of vectors removed
+        """
+        with self._lock:
+            removed = {self._positions[item_id] for item_id in item_ids if item_id in self._positions}
+            if not removed:
+                return 0
+            keep = np.ones(self._size, dtype=bool)
+            keep[list(removed)] = False
+            self._vectors = self.vectors[keep]
+            self._ids = [item_id for position, item_id in enumerate(self._ids) if keep[position]]
+            self._positions = {item_id: position for position, item_id in enumerate(self._ids)}
+            self._size = len(self._ids)
+            if self._centroids is not None:
+                self._lists = self._clustered(self.vectors, self._centroids)
+            self._version += 1
+            return len(removed)
+
+    def _use_ivf(self) -> bool:
+        if self.mode == "ivf":
+            return self._size > 0
+        return self.mode == "auto" and self._size >= self.ivf_min_size
+
+    @staticmethod
+    def _clustered(vectors: np.ndarray, centroids: np.ndarray) -> List[List[int]]:
+        """IVF lists assigning each vector to its nearest centroid"""
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        return [np.flatnonzero(assignment == cluster).tolist() for cluster in range(len(centroids))]
+
+    def _assigned(self, positions: List[int], replaced: set) -> List[List[int]]:
+        """Copy of the IVF lists with positions added to their nearest cluster
+
+        Positions in replaced are first dropped from their old cluster. Only
+        the lists that change are copied.
+        """
+        clusters = np.argmax(self._vectors[positions] @ self._centroids.T, axis=1)
+        lists = list(self._lists)
+        if replaced:
+            for cluster, members in enumerate(lists):
+                if not replaced.isdisjoint(members):
+                    lists[cluster] = [position for position in members if position not in replaced]
+        for position, cluster in zip(positions, clusters.tolist()):
+            if lists[cluster] is self._lists[cluster]:
+                lists[cluster] = list(lists[cluster])
+            lists[cluster].append(position)
+        return lists
+
+    def train(self, iterations: int = 10, seed: int = 0):
+        """Cluster the current vectors into IVF lists with spherical k-means
+
+        Runs on a snapshot outside the lock; if vectors changed meanwhile,
+        the current ones are assigned to the new centroids before they are
+        swapped in.
+        """
+        with self._lock:
+            size, version = self._size, self._version
+            vectors = self._vectors[:size]
+        if size == 0:
+            return
+        n_lists = min(self.n_lists or max(1, int(np.sqrt(size))), size)
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(size, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = vectors[assignment == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+
+        lists = self._clustered(vectors, centroids)
+        with self._lock:
+            if self._version != version:
+                lists = self._clustered(self.vectors, centroids)
+            self._centroids = centroids
+            self._lists = lists
+            self._trained_size = self._size
+
+    def search(
+        self,
+        query: List[float],
+        k: int = 5,
+        exact: Optional[bool] = None,
+        allowed: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return the k nearest ids with their cosine similarity, best first
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            exact: Force (True) or skip (False) brute force; defaults to the index mode
+            allowed: Only consider these ids (a pre-filter); they are scored
+                exactly, which costs no more than the filter is selective
+        """
+        with self._lock:
+            # Mutations replace these objects or only grow them past size
+            size, vectors, ids, positions = self._size, self._vectors, self._ids, self._positions
+            centroids, lists = self._centroids, self._lists
+            use_ivf = self._use_ivf()
+        if size == 0 or k <= 0:
+            return []
+        query = _normalize(np.asarray(query, dtype=np.float32))
+
+        if allowed is not None:
+            candidates = np.fromiter(
+                (positions[item_id] for item_id in allowed if positions.get(item_id, size) < size),
+                dtype=np.int64,
+            )
+            if len(candidates) == 0:
+                return []
+            scores = vectors[candidates] @ query
+            top = _top_k(scores, k)
+            return [(ids[candidates[i]], float(scores[i])) for i in top]
+
+        if exact is None:
+            exact = centroids is None or not use_ivf
+        if exact or centroids is None:
+            scores = vectors[:size] @ query
+            top = _top_k(scores, k)
+            return [(ids[i], float(scores[i])) for i in top]
+
+        probes = _top_k(centroids @ query, self.n_probe)
+        candidates = np.fromiter(
+            (position for cluster in probes for position in lists[cluster] if position < size), dtype=np.int64
+        )
+        if len(candidates) == 0:
+            return []
+        scores = vectors[candidates] @ query
+        top = _top_k(scores, k)
+        return [(ids[candidates[i]], float(scores[i])) for i in top]
+
+    def save(self, path: str):
+        """Write the matrix to path.npy and the ids to path.json"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.save(f"{path}.npy", self.vectors)
+        with open(f"{path}.json", "w") as f:
+            json.dump(self._ids, f)
+
+    def load(self, path: str, mmap: bool = True) -> bool:
+        """Load a saved index, memory-mapping the matrix by default
+
+        The mapping is read-only; the matrix is copied into memory the first
+        time new vectors are added.
+
+        Returns:
+            False if no saved index exists at path
+        """
+        if not (os.path.exists(f"{path}.npy") and os.path.exists(f"{path}.json")):
+            return False
+        vectors = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        with open(f"{path}.json") as f:
+            ids = json.load(f)
+        self._vectors = vectors
+        self._size = len(ids)
+        self._ids = ids
+        self._positions = {item_id: position for position, item_id in enumerate(ids)}
+        self._centroids = None
+        self._lists = []
+        self._version += 1
+        if self._use_ivf():
+            self.train()
+        return True